@@ -3,18 +3,40 @@ Mov CLI - Command line interface for managing Memov MCP servers
 """
 
 import datetime
-import json
+import os
+import signal
 import socket
 import subprocess
+import sys
 import time
 from pathlib import Path
 from typing import Annotated, Any, Optional
 
+import orjson
 import psutil
 import typer
 
 from mem_mcp_server.globals import CONFIG_DIR
 
+# Listeners bound to these addresses accept connections on every local address
+_WILDCARD_ADDRESSES = frozenset({"0.0.0.0", "::", ""})
+
+
+def _listening_addresses() -> Optional[frozenset[tuple[str, int]]]:
+    """Current (ip, port) pairs of local TCP sockets in LISTEN state, or None if not permitted
+
+    Taken fresh on every call: another process may bind a port at any time.
+    """
+    try:
+        return frozenset(
+            (conn.laddr.ip, conn.laddr.port)
+            for conn in psutil.net_connections(kind="inet")
+            if conn.status == psutil.CONN_LISTEN and conn.laddr
+        )
+    except (psutil.AccessDenied, OSError):
+        # e.g. macOS requires root to list other processes' sockets
+        return None
+
 
 class ServerCLI:
     """CLI manager for Mem MCP servers"""
@@ -23,22 +45,30 @@ class ServerCLI:
         self.config_dir = CONFIG_DIR
         self.pid_file = self.config_dir / "servers.json"
         self.config_dir.mkdir(exist_ok=True)
+        # Parsed PID file, loaded once per CLI invocation and mutated in place
+        self._servers_cache: Optional[dict] = None
 
     def load_servers(self) -> dict:
-        """Load running servers from PID file"""
-        if not self.pid_file.exists():
-            return {}
-
-        try:
-            with open(self.pid_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
+        """Load running servers from PID file (memoized for this process)"""
+        if self._servers_cache is not None:
+            return self._servers_cache
+
+        servers = {}
+        if self.pid_file.exists():
+            try:
+                servers = orjson.loads(self.pid_file.read_bytes())
+            except (orjson.JSONDecodeError, IOError):
+                servers = {}
+
+        self._servers_cache = servers
+        return servers
 
     def save_servers(self, servers: dict) -> None:
-        """Save running servers to PID file"""
-        with open(self.pid_file, "w") as f:
-            json.dump(servers, f, indent=2)
+        """Save running servers to PID file atomically"""
+        self._servers_cache = servers
+        tmp_file = self.pid_file.with_suffix(".tmp")
+        tmp_file.write_bytes(orjson.dumps(servers))
+        os.replace(tmp_file, self.pid_file)
 
     def start_server(self, workspace: str, port: int = 8000, host: str = "127.0.0.1") -> bool:
         """Start a new MCP server in background"""
@@ -68,25 +98,36 @@ class ServerCLI:
 
         # Start server in background
         try:
-            # Start the server process using uvx
-            process = subprocess.Popen(
-                [
-                    "uv",
-                    "run",
-                    "mem-mcp-launcher",
-                    "http",
-                    str(workspace_path),
-                    "--port",
-                    str(port),
-                    "--host",
-                    host,
-                    "--port",
-                    str(port),
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
+            # Launch the entry point module directly with this interpreter instead of
+            # going through `uv run` (saves a resolver pass and two process startups)
+            cmd = [
+                sys.executable,
+                "-m",
+                "mem_mcp_server.server.mcp_launcher",
+                "http",
+                str(workspace_path),
+                "--host",
+                host,
+                "--port",
+                str(port),
+            ]
+            if sys.platform == "win32":
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+                )
+            else:
+                # Own session/process group so stop can signal the whole tree at once
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    start_new_session=True,
+                )
 
             # Wait a moment to see if it starts successfully
             time.sleep(2)
@@ -134,10 +175,8 @@ class ServerCLI:
                 typer.echo("ℹ️  No servers running")
                 return
 
-            stopped_count = 0
-            for server_key, server_info in servers.items():
-                if self.stop_single_server(server_key, server_info):
-                    stopped_count += 1
+            stopped_count = self.stop_servers(list(servers.items()))
+            self.save_servers(servers)
 
             if stopped_count > 0:
                 print(f"✅ Stopped {stopped_count} server(s)")
@@ -150,7 +189,9 @@ class ServerCLI:
             workspace_path = Path(workspace).resolve()
             server_key = self.get_server_key(str(workspace_path), port)
             if server_key in servers:
-                if self.stop_single_server(server_key, servers[server_key]):
+                stopped = self.stop_single_server(server_key, servers[server_key])
+                self.save_servers(servers)
+                if stopped:
                     print(f"✅ Stopped server for workspace {workspace} on port {port}")
                 else:
                     print(f"ℹ️  Server for workspace {workspace} on port {port} was not running")
@@ -161,11 +202,10 @@ class ServerCLI:
             # Stop all servers for this workspace
             workspace_path = Path(workspace).resolve()
             workspace_str = str(workspace_path)
-            stopped_count = 0
-            for server_key, server_info in list(servers.items()):
-                if server_info["workspace"] == workspace_str:
-                    if self.stop_single_server(server_key, server_info):
-                        stopped_count += 1
+            stopped_count = self.stop_servers(
+                [item for item in servers.items() if item[1]["workspace"] == workspace_str]
+            )
+            self.save_servers(servers)
 
             if stopped_count > 0:
                 print(f"✅ Stopped {stopped_count} server(s) for workspace {workspace}")
@@ -174,11 +214,10 @@ class ServerCLI:
             return
         elif port:
             # Stop all servers on this port
-            stopped_count = 0
-            for server_key, server_info in list(servers.items()):
-                if server_info["port"] == port:
-                    if self.stop_single_server(server_key, server_info):
-                        stopped_count += 1
+            stopped_count = self.stop_servers(
+                [item for item in servers.items() if item[1]["port"] == port]
+            )
+            self.save_servers(servers)
 
             if stopped_count > 0:
                 print(f"✅ Stopped {stopped_count} server(s) on port {port}")
@@ -190,40 +229,58 @@ class ServerCLI:
             return
 
     def stop_single_server(self, server_key: str, server_info: dict) -> bool:
-        """Stop a single server"""
-
-        def del_server_key():
-            """Delete server key from config"""
-            servers = self.load_servers()
-            if server_key in servers:
-                del servers[server_key]
-                self.save_servers(servers)
+        """Stop a single server (caller is responsible for save_servers)"""
+        return self.stop_servers([(server_key, server_info)]) == 1
 
-        pid = server_info["pid"]
+    def stop_servers(self, targets: list[tuple[str, dict]]) -> int:
+        """Stop several servers, waiting on all of their processes in one pass
 
-        try:
-            process = psutil.Process(pid)
-            children = process.children(recursive=True)
-            for child in children:
-                child.terminate()
-            process.terminate()
+        Every process tree is sent terminate() first and a single wait_procs call
+        covers the union, so stopping K servers costs one timeout instead of K.
+        Stopped and already-dead servers are removed from the in-memory config;
+        the caller is responsible for save_servers.
 
-            # process.wait(timeout=5)
-            gone, alive = psutil.wait_procs([process] + children, timeout=5)
+        Returns:
+            Number of servers that were running and have been stopped
+        """
+        servers = self.load_servers()
+        all_procs = []
+        stopped_count = 0
 
+        for server_key, server_info in targets:
+            pid = server_info["pid"]
+            try:
+                process = psutil.Process(pid)
+                children = process.children(recursive=True)
+                if hasattr(os, "killpg") and os.getpgid(pid) == pid:
+                    # Server leads its own process group: one signal reaches the whole tree
+                    os.killpg(pid, signal.SIGTERM)
+                else:
+                    for child in children:
+                        child.terminate()
+                    process.terminate()
+            except psutil.NoSuchProcess:
+                # Process already dead
+                servers.pop(server_key, None)
+                continue
+            except Exception as e:
+                print(f"❌ Error stopping server {pid}: {e}")
+                continue
+
+            all_procs.append(process)
+            all_procs.extend(children)
+            servers.pop(server_key, None)
+            stopped_count += 1
+
+        if all_procs:
+            gone, alive = psutil.wait_procs(all_procs, timeout=5)
             for p in alive:
-                p.kill()
-
-            # Remove from config
-            del_server_key()
-            return True
-        except psutil.NoSuchProcess:
-            # Process already dead
-            del_server_key()
-            return False
-        except Exception as e:
-            print(f"❌ Error stopping server {pid}: {e}")
-            return False
+                try:
+                    p.kill()
+                except psutil.NoSuchProcess:
+                    pass
+
+        return stopped_count
 
     def status(self, verbose: bool = True) -> dict[str, dict[str, Any]]:
         """Show status of all servers"""
@@ -234,12 +291,12 @@ class ServerCLI:
                 typer.echo("ℹ️  No servers running")
             return servers
 
-        if verbose:
-            typer.echo("🔄 Mov Server Status:")
-            typer.echo("-" * 80)
+        # Collect the report and emit it with a single write at the end
+        lines = ["🔄 Mov Server Status:", "-" * 80]
 
         running_count = 0
         server_to_delete = []
+        now = time.time()
         for server_key, server_info in servers.items():
             pid = server_info["pid"]
             workspace = server_info["workspace"]
@@ -248,30 +305,47 @@ class ServerCLI:
             start_timestamp = server_info["start_timestamp"]
             start_time = server_info["start_time"]
 
-            if psutil.pid_exists(pid):
+            # One /proc lookup per server instead of pid_exists + Process + memory_info
+            running = False
+            rss = 0
+            try:
                 process = psutil.Process(pid)
-                uptime = time.time() - start_timestamp
+                running = True
+                rss = process.memory_info().rss if verbose else 0
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.AccessDenied:
+                # Alive but owned by another user
+                running = True
+
+            if running:
+                uptime = now - start_timestamp
                 uptime_str = datetime.timedelta(seconds=int(uptime))
                 running_count += 1
 
                 if verbose:
-                    typer.echo(f"✅ Running (PID: {pid})")
-                    typer.echo(f"   📁 Workspace: {workspace}")
-                    typer.echo(f"   🌐 URL: http://{host}:{port}/mcp")
-                    typer.echo(f"   ⏱️ Start time: {start_time}")
-                    typer.echo(f"   ⏱️ Uptime: {uptime_str}")
-                    typer.echo(f"   💾 Memory: {process.memory_info().rss / 1024 / 1024:.1f} MB")
-                    typer.echo()
+                    lines += [
+                        f"✅ Running (PID: {pid})",
+                        f"   📁 Workspace: {workspace}",
+                        f"   🌐 URL: http://{host}:{port}/mcp",
+                        f"   ⏱️ Start time: {start_time}",
+                        f"   ⏱️ Uptime: {uptime_str}",
+                        f"   💾 Memory: {rss >> 20} MB",
+                        "",
+                    ]
             else:
                 if verbose:
-                    typer.echo(f"❌ Dead (PID: {pid})")
-                    typer.echo(f"   📁 Workspace: {workspace}")
-                    typer.echo(f"   🌐 Port: {port}")
-                    typer.echo()
+                    lines += [
+                        f"❌ Dead (PID: {pid})",
+                        f"   📁 Workspace: {workspace}",
+                        f"   🌐 Port: {port}",
+                        "",
+                    ]
                 server_to_delete.append(server_key)  # Mark for deletion
 
         if verbose:
-            typer.echo(f"📊 Summary: {running_count}/{len(servers)} servers running")
+            lines.append(f"📊 Summary: {running_count}/{len(servers)} servers running")
+            typer.echo("\n".join(lines))
 
         # Clean up dead servers and their config
         for server_key in server_to_delete:
@@ -282,6 +356,18 @@ class ServerCLI:
 
     def is_port_in_use(self, host: str, port: int) -> bool:
         """Check if port is already in use"""
+        listening = _listening_addresses()
+        if listening is not None:
+            ip = "127.0.0.1" if host == "localhost" else host
+            # A wildcard bind on either side overlaps every specific address
+            return any(
+                listen_port == port
+                and (
+                    listen_ip == ip or listen_ip in _WILDCARD_ADDRESSES or ip in _WILDCARD_ADDRESSES
+                )
+                for listen_ip, listen_port in listening
+            )
+
         # TODO: change to check http://ip:port/health
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.settimeout(1)
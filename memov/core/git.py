@@ -2,14 +2,37 @@ import logging
 import os
 import subprocess
 import sys
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from memov.utils.string_utils import clean_windows_git_lstree_output, split_path_parts
 
+try:
+    import pygit2
+
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
 LOGGER = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _open_pygit2_repo(bare_repo: str) -> "pygit2.Repository":
+    """Open (and cache) a libgit2 handle for the bare repository."""
+    return pygit2.Repository(bare_repo)
+
+
+def nested_tree() -> defaultdict:
+    """Return an empty tree structure whose missing directories are created on first access.
+
+    Format: {"dir1": {"dir2": {"file.txt": blob_hash}}}; walking a path costs one lookup per part.
+    """
+    return defaultdict(nested_tree)
+
+
 def subprocess_call(
     command: list[str], input: str = None, text: bool = True
 ) -> tuple[bool, Optional[subprocess.CompletedProcess]]:
@@ -288,11 +311,15 @@ class GitManager:
 
     @staticmethod
     def write_blob_to_bare_repo(
-        bare_repo: str, new_file_paths: dict[str, str], commit_msg: str
+        bare_repo: str,
+        new_file_paths: dict[str, str],
+        commit_msg: str,
+        parent_hash: Optional[str] = None,
     ) -> str:
         """Write files as blobs in the bare Git repository and create a proper tree structure.
 
         This handles nested directories by creating a hierarchical tree structure.
+        The commit's parent is ``parent_hash`` when given, else refs/memov/HEAD.
         """
         if len(new_file_paths) == 0:
             return ""
@@ -309,7 +336,7 @@ class GitManager:
 
         # Build a directory tree structure
         # Format: {"dir1": {"dir2": {"file.txt": blob_hash}}}
-        tree_structure = {}
+        tree_structure = nested_tree()
 
         for rel_file, abs_path in new_file_paths.items():
             blob_hash = path_to_blob.get(abs_path)
@@ -321,10 +348,8 @@ class GitManager:
             parts = split_path_parts(rel_file)
             current = tree_structure
 
-            # Navigate/create nested structure
+            # Navigate nested structure; missing directories are created on access
             for part in parts[:-1]:  # All parts except the filename
-                if part not in current:
-                    current[part] = {}
                 current = current[part]
 
             # Add the file blob
@@ -355,7 +380,10 @@ class GitManager:
             return ""
 
         # Get the parent commit hash
-        parent_hash = GitManager.get_commit_id_by_ref(bare_repo, "refs/memov/HEAD", verbose=False)
+        if parent_hash is None:
+            parent_hash = GitManager.get_commit_id_by_ref(
+                bare_repo, "refs/memov/HEAD", verbose=False
+            )
 
         # Commit the tree
         commit_hash = GitManager.commit_tree(bare_repo, tree_hash, commit_msg, parent_hash)
@@ -441,6 +469,18 @@ class GitManager:
         Returns:
             List[str]: Commit hashes from oldest to newest.
         """
+        if PYGIT2_AVAILABLE:
+            # In-process walk via libgit2, avoids a fork+exec of git per call
+            try:
+                repo = _open_pygit2_repo(bare_repo)
+                tip_commit = repo.revparse_single(tip).peel(pygit2.Commit)
+                walker = repo.walk(
+                    tip_commit.id, pygit2.enums.SortMode.TOPOLOGICAL | pygit2.enums.SortMode.REVERSE
+                )
+                return [str(commit.id) for commit in walker]
+            except (pygit2.GitError, KeyError, ValueError) as e:
+                LOGGER.debug(f"pygit2 walk failed for {tip}, falling back to git rev-list: {e}")
+
         command = ["git", f"--git-dir={bare_repo}", "rev-list", "--reverse", tip]
         success, output = subprocess_call(command=command)
 
@@ -490,6 +530,23 @@ class GitManager:
             )
             return None
 
+    @staticmethod
+    def list_refs(bare_repo: str) -> Optional[str]:
+        """Return every ref and the object it points to, one "<sha> <refname>" per line."""
+        command = [
+            "git",
+            f"--git-dir={bare_repo}",
+            "for-each-ref",
+            "--format=%(objectname) %(refname)",
+        ]
+        success, output = subprocess_call(command=command)
+
+        if success:
+            return output.stdout
+        else:
+            LOGGER.error(f"Failed to list refs in repository at {bare_repo}")
+            return None
+
     @staticmethod
     def update_ref(bare_repo: str, ref_name: str, commit_id: str) -> None:
         """Update a reference in the bare Git repository."""
@@ -641,11 +698,14 @@ class GitManager:
         return result
 
     @staticmethod
-    def get_all_notes_batch(repo_path: str) -> dict[str, str]:
+    def get_all_notes_batch(
+        repo_path: str, commit_hashes: Optional[list[str]] = None
+    ) -> dict[str, str]:
         """Get all git notes in one call.
 
         Args:
             repo_path: Path to the Git repository.
+            commit_hashes: Only fetch the notes of these (full) commit hashes.
 
         Returns:
             Dictionary mapping commit hash to note content.
@@ -670,6 +730,10 @@ class GitManager:
                 blob_hash, commit_hash = parts[0], parts[1]
                 note_refs[commit_hash] = blob_hash
 
+        if commit_hashes is not None:
+            wanted = set(commit_hashes)
+            note_refs = {c: b for c, b in note_refs.items() if c in wanted}
+
         if not note_refs:
             return {}
 
@@ -714,6 +778,113 @@ class GitManager:
 
         return result
 
+    @staticmethod
+    def get_commit_bundle(repo_path: str, commit_hashes: list[str]) -> dict[str, dict]:
+        """Get message, full file list and git note for many commits in a fixed number of git calls.
+
+        One `git cat-file --batch-check` resolves the requested hashes, one `git log` reads
+        messages and tree ids, one `git diff-tree --stdin` lists every tree's files (each
+        diffed against the empty tree), and the notes are batch-read; the per-commit
+        getters would spawn three processes per commit instead.
+
+        Args:
+            repo_path: Path to the Git repository.
+            commit_hashes: Commit hashes (full or abbreviated).
+
+        Returns:
+            Dictionary keyed by each requested hash, exactly as passed in, that git could
+            resolve to a commit, mapping to a dict with keys:
+                - message: Full commit message
+                - files: Relative paths of all files in the commit's tree
+                - note: Git note content ("" if none)
+        """
+        if not commit_hashes:
+            return {}
+
+        # Resolve each requested (possibly abbreviated) hash to its full commit hash;
+        # cat-file answers one line per input, in order, and reports unknown or ambiguous
+        # names instead of failing the batch
+        command = [
+            "git",
+            f"--git-dir={repo_path}",
+            "cat-file",
+            "--batch-check=%(objectname) %(objecttype)",
+        ]
+        success, output = subprocess_call(
+            command=command, input="".join(f"{h}\n" for h in commit_hashes)
+        )
+        if not success or not output.stdout:
+            return {}
+
+        resolved = {}  # requested hash -> full hash
+        for requested, line in zip(commit_hashes, output.stdout.splitlines()):
+            parts = line.split()
+            if len(parts) == 2 and parts[1] == "commit":
+                resolved[requested] = parts[0]
+        if not resolved:
+            return {}
+
+        record_sep = "<<<RECORD_SEP>>>"
+        field_sep = "<<<FIELD_SEP>>>"
+        command = [
+            "git",
+            f"--git-dir={repo_path}",
+            "log",
+            f"--format=%H{field_sep}%T{field_sep}%B{record_sep}",
+            "--no-walk=unsorted",
+            "--stdin",
+        ]
+        success, output = subprocess_call(
+            command=command, input="\n".join(dict.fromkeys(resolved.values()))
+        )
+        if not success or not output.stdout:
+            return {}
+
+        commits = {}  # full hash -> (tree hash, message)
+        for record in output.stdout.split(record_sep):
+            parts = record.strip().split(field_sep)
+            if len(parts) >= 3:
+                commits[parts[0]] = (parts[1], parts[2].strip())
+
+        # diff-tree prints "<empty> <tree>" before each tree's NUL-separated paths
+        empty_tree = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+        files_by_tree = {tree: [] for tree, _ in commits.values()}
+        command = [
+            "git",
+            f"--git-dir={repo_path}",
+            "diff-tree",
+            "--stdin",
+            "-r",
+            "--name-only",
+            "-z",
+        ]
+        # diff-tree drops a final line without a newline
+        input_data = "".join(f"{empty_tree} {tree}\n" for tree in files_by_tree)
+        success, output = subprocess_call(command=command, input=input_data)
+        if success and output.stdout:
+            current = None
+            for token in output.stdout.split("\0"):
+                if token.startswith(f"{empty_tree} ") and "\n" in token:
+                    header, token = token.split("\n", 1)
+                    current = files_by_tree.get(header.split()[1])
+                if token and current is not None:
+                    current.append(token)
+
+        notes = GitManager.get_all_notes_batch(repo_path, list(commits))
+
+        result = {}
+        for requested, full_hash in resolved.items():
+            if full_hash not in commits:
+                continue
+            tree, message = commits[full_hash]
+            result[requested] = {
+                "message": message,
+                "files": list(files_by_tree[tree]),
+                "note": notes.get(full_hash, ""),
+            }
+
+        return result
+
     @staticmethod
     def get_diff_status_batch(
         repo_path: str, commit_hashes: list[str]
@@ -5,14 +5,15 @@ import os
 import tarfile
 import traceback
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import pathspec
 
-from memov.core.git import GitManager
+from memov.core.git import GitManager, nested_tree
 from memov.storage import CHROMADB_AVAILABLE
 from memov.storage.vectordb import VectorDB
 from memov.utils.print_utils import Color
@@ -20,6 +21,9 @@ from memov.utils.string_utils import normalize_path_separator, short_msg, split_
 
 LOGGER = logging.getLogger(__name__)
 
+# Section labels recognised in commit messages / git notes, mapped to result keys
+_NOTE_LABELS = (("Prompt:", "prompt"), ("Response:", "response"), ("Agent Plan:", "agent_plan"))
+
 
 class MemStatus(Enum):
     """Mem operation status."""
@@ -85,7 +89,8 @@ class MemovManager:
             # - "sentence-transformers": Original (~1.5GB)
             embedding_backend = os.getenv("MEMOV_EMBEDDING_BACKEND", "default")
 
-            self._vectordb = VectorDB(
+            # Shared per process, so the collection and embedding model load only once
+            self._vectordb = VectorDB.shared(
                 persist_directory=Path(self.vectordb_path),
                 collection_name="memov_memories",
                 chunk_size=768,
@@ -247,7 +252,7 @@ class MemovManager:
                 )
 
                 # Build tree structure
-                tree_structure = {}
+                tree_structure = nested_tree()
 
                 # Add existing files with their HEAD blob hashes (preserve their state)
                 for rel_path in tracked_file_rel_paths:
@@ -257,8 +262,6 @@ class MemovManager:
                         parts = split_path_parts(rel_path)
                         current = tree_structure
                         for part in parts[:-1]:
-                            if part not in current:
-                                current[part] = {}
                             current = current[part]
                         current[parts[-1]] = blob_hash
 
@@ -276,8 +279,6 @@ class MemovManager:
                     parts = split_path_parts(rel_path)
                     current = tree_structure
                     for part in parts[:-1]:
-                        if part not in current:
-                            current[part] = {}
                         current = current[part]
                     current[parts[-1]] = blob_hash
 
@@ -362,28 +363,12 @@ class MemovManager:
             MemStatus indicating success or failure
         """
         try:
-            # Check if we're on a branch (not detached)
-            branches = self._load_branches()
-            if branches and branches.get("current") is None:
-                LOGGER.error(
-                    "Not on any branch. Use 'mem switch <branch>' to create or switch to a branch first."
-                )
-                return MemStatus.UNKNOWN_ERROR
-
-            # Get all tracked files in the memov repo and their previous blob hashes
-            tracked_file_rel_paths, tracked_file_abs_paths = [], []
-            head_commit = GitManager.get_commit_id_by_ref(
-                self.bare_repo_path, "refs/memov/HEAD", verbose=False
+            # Only a full-project snapshot reports untracked files
+            status, head_commit, tracked_file_rel_paths, tracked_file_abs_paths = (
+                self._snapshot_base(warn_untracked=file_paths is None)
             )
-            if head_commit:
-                tracked_file_rel_paths, tracked_file_abs_paths = GitManager.get_files_by_commit(
-                    self.bare_repo_path, head_commit
-                )
-
-            # Return early if no tracked files are found
-            if len(tracked_file_rel_paths) == 0:
-                LOGGER.warning("No tracked files to snapshot. Please track files first.")
-                return MemStatus.SUCCESS
+            if status is not None:
+                return status
 
             # If specific files are provided, only update those files in the snapshot
             if file_paths is not None:
@@ -448,7 +433,7 @@ class MemovManager:
                 path_to_blob = GitManager.write_blobs(self.bare_repo_path, files_to_hash)
 
                 # Build tree structure
-                tree_structure = {}
+                tree_structure = nested_tree()
                 for rel_path in tracked_file_rel_paths:
                     if rel_path in tracked_specified and rel_path not in missing_files:
                         # Use batch-computed blob hash
@@ -467,8 +452,6 @@ class MemovManager:
                     parts = split_path_parts(rel_path)
                     current = tree_structure
                     for part in parts[:-1]:
-                        if part not in current:
-                            current[part] = {}
                         current = current[part]
                     current[parts[-1]] = blob_hash
 
@@ -476,7 +459,9 @@ class MemovManager:
                 commit_hash = GitManager.create_commit_from_tree_structure(
                     self.bare_repo_path,
                     tree_structure,
-                    f"Create snapshot\n\nFiles: {', '.join(sorted(tracked_specified))}\nPrompt: {prompt}\nResponse: {response}\nAgent Plan: {agent_plan}\nSource: {'User' if by_user else 'AI'}",
+                    self._snapshot_commit_msg(
+                        prompt, response, agent_plan, by_user, files=tracked_specified
+                    ),
                 )
 
                 if not commit_hash:
@@ -503,51 +488,224 @@ class MemovManager:
                 )
 
                 return MemStatus.SUCCESS
-            else:
-                # Original behavior: snapshot all tracked files
-                # Filter out new files that are not tracked or should be ignored
-                new_files = self._filter_new_files([self.project_path], tracked_file_rel_paths)
 
-                # If there are untracked files, warn the user
-                if len(new_files) != 0:
-                    LOGGER.warning(
-                        f"{Color.RED}Untracked files present: {new_files}. They will not be included in the snapshot.{Color.RESET}"
-                    )
+            # Original behavior: snapshot all tracked files
+            self._validate_and_fix_branches()
+            GitManager.ensure_git_user_config(
+                self.bare_repo_path, self.default_name, self.default_email
+            )
+            commit_hash = self._commit_snapshot_entry(
+                dict(zip(tracked_file_rel_paths, tracked_file_abs_paths)),
+                tracked_file_rel_paths,
+                prompt,
+                response,
+                agent_plan,
+                by_user,
+                parent_hash=head_commit,
+            )
+            if not commit_hash:
+                LOGGER.error("Failed to create snapshot commit")
+                return MemStatus.FAILED_TO_COMMIT
 
-                # Build commit file paths with all tracked files
-                commit_file_paths = {}
-                for rel_path, abs_path in zip(tracked_file_rel_paths, tracked_file_abs_paths):
-                    commit_file_paths[rel_path] = abs_path
+            self._update_branch(commit_hash)
+            # Pending write is queued; sync later via mem sync
+            self._save_pending_writes()
+            LOGGER.info("Snapshot created in memov repo.")
+            return MemStatus.SUCCESS
+        except Exception as e:
+            LOGGER.error(f"Error creating snapshot in memov repo: {e}")
+            return MemStatus.UNKNOWN_ERROR
 
-                LOGGER.debug(f"snapshot: commit_file_paths has {len(commit_file_paths)} entries")
-                for i, (rel, abs_p) in enumerate(list(commit_file_paths.items())[:3]):
-                    LOGGER.debug(
-                        f"snapshot: commit_file_paths[{i}]: rel={repr(rel)}, abs={repr(abs_p)}"
-                    )
+    def snapshot_many(self, entries: list[dict]) -> MemStatus:
+        """Record several full-project snapshots in order, one commit per entry.
 
-                commit_msg = "Create snapshot\n\n"
-                commit_msg += f"Prompt: {prompt}\nResponse: {response}\nAgent Plan: {agent_plan}\nSource: {'User' if by_user else 'AI'}"
+        Branch validation, the tracked-file listing, the untracked-file scan and the
+        git user config check run once for the whole batch instead of once per snapshot.
+        Commits are chained in memory and the branch, HEAD and pending-writes file are
+        updated once at the end; entries that change no files reuse the previous tree,
+        costing a single ``git commit-tree``.
 
-            commit_hash = self._commit(commit_msg, commit_file_paths)
-            LOGGER.info("Snapshot created in memov repo.")
+        Args:
+            entries: List of dicts with optional keys:
+                - files: Mapping of project-relative path to text content, written to
+                  the workspace before that entry's snapshot is taken
+                - prompt, response, agent_plan: Text recorded with the snapshot
+                - by_user: Whether the snapshot was initiated by the user (default: False)
 
-            # Add to pending writes (will be synced later via mem sync)
-            if commit_hash:
-                self._add_to_pending_writes(
-                    operation_type="snap",
-                    commit_hash=commit_hash,
-                    prompt=prompt,
-                    response=response,
-                    agent_plan=agent_plan,
-                    by_user=by_user,
-                    files=tracked_file_rel_paths,
+        Returns:
+            MemStatus indicating success or failure
+        """
+        try:
+            # Tracked files do not change across snapshots, so list them once
+            status, head_commit, tracked_file_rel_paths, tracked_file_abs_paths = (
+                self._snapshot_base(warn_untracked=True)
+            )
+            if status is not None:
+                return status
+
+            commit_file_paths = dict(zip(tracked_file_rel_paths, tracked_file_abs_paths))
+
+            self._validate_and_fix_branches()
+            GitManager.ensure_git_user_config(
+                self.bare_repo_path, self.default_name, self.default_email
+            )
+
+            # Chain the commits locally and move the branch/HEAD once at the end
+            parent_hash = head_commit
+            tree_hash = None
+            for entry in entries:
+                files = entry.get("files") or {}
+                for rel_path, content in files.items():
+                    Path(self.project_path, rel_path).write_text(content)
+                # Only an entry that wrote files needs a new tree; otherwise the previous
+                # entry's tree is still current and is reused
+                if files:
+                    tree_hash = None
+
+                commit_hash = self._commit_snapshot_entry(
+                    commit_file_paths,
+                    tracked_file_rel_paths,
+                    entry.get("prompt"),
+                    entry.get("response"),
+                    entry.get("agent_plan"),
+                    entry.get("by_user", False),
+                    parent_hash=parent_hash,
+                    tree_hash=tree_hash,
                 )
+                if not commit_hash:
+                    LOGGER.error("Failed to create snapshot commit")
+                    if parent_hash != head_commit:
+                        self._update_branch(parent_hash)
+                        self._save_pending_writes()
+                    return MemStatus.FAILED_TO_COMMIT
+
+                if tree_hash is None:
+                    tree_hash = GitManager.get_tree_hash(self.bare_repo_path, commit_hash)
+                parent_hash = commit_hash
 
+            if parent_hash != head_commit:
+                self._update_branch(parent_hash)
+                self._save_pending_writes()
+
+            LOGGER.info(f"{len(entries)} snapshot(s) created in memov repo.")
             return MemStatus.SUCCESS
         except Exception as e:
-            LOGGER.error(f"Error creating snapshot in memov repo: {e}")
+            LOGGER.error(f"Error creating snapshots in memov repo: {e}")
             return MemStatus.UNKNOWN_ERROR
 
+    def _snapshot_base(
+        self, warn_untracked: bool
+    ) -> tuple[Optional[MemStatus], str, list[str], list[str]]:
+        """Shared start of snapshot and snapshot_many: branch check, then the files tracked at HEAD.
+
+        Args:
+            warn_untracked: Also warn about workspace files that are not tracked
+
+        Returns:
+            (status, head commit, tracked relative paths, tracked absolute paths); a status
+            other than None means there is nothing to snapshot and the caller returns it
+        """
+        # Check if we're on a branch (not detached)
+        branches = self._load_branches()
+        if branches and branches.get("current") is None:
+            LOGGER.error(
+                "Not on any branch. Use 'mem switch <branch>' to create or switch to a branch first."
+            )
+            return MemStatus.UNKNOWN_ERROR, "", [], []
+
+        # Get all tracked files in the memov repo
+        tracked_file_rel_paths, tracked_file_abs_paths = [], []
+        head_commit = GitManager.get_commit_id_by_ref(
+            self.bare_repo_path, "refs/memov/HEAD", verbose=False
+        )
+        if head_commit:
+            tracked_file_rel_paths, tracked_file_abs_paths = GitManager.get_files_by_commit(
+                self.bare_repo_path, head_commit
+            )
+
+        # Return early if no tracked files are found
+        if len(tracked_file_rel_paths) == 0:
+            LOGGER.warning("No tracked files to snapshot. Please track files first.")
+            return MemStatus.SUCCESS, head_commit, [], []
+
+        if warn_untracked:
+            new_files = self._filter_new_files([self.project_path], tracked_file_rel_paths)
+            if len(new_files) != 0:
+                LOGGER.warning(
+                    f"{Color.RED}Untracked files present: {new_files}. They will not be included in the snapshot.{Color.RESET}"
+                )
+
+        return None, head_commit, tracked_file_rel_paths, tracked_file_abs_paths
+
+    @staticmethod
+    def _snapshot_commit_msg(
+        prompt: Optional[str],
+        response: Optional[str],
+        agent_plan: Optional[str],
+        by_user: bool,
+        files: Optional[set[str]] = None,
+    ) -> str:
+        """Commit message of a snapshot; `files` lists the files of a partial snapshot."""
+        commit_msg = "Create snapshot\n\n"
+        if files is not None:
+            commit_msg += f"Files: {', '.join(sorted(files))}\n"
+        commit_msg += f"Prompt: {prompt}\nResponse: {response}\nAgent Plan: {agent_plan}\nSource: {'User' if by_user else 'AI'}"
+        return commit_msg
+
+    def _commit_snapshot_entry(
+        self,
+        commit_file_paths: dict[str, str],
+        tracked_file_rel_paths: list[str],
+        prompt: Optional[str],
+        response: Optional[str],
+        agent_plan: Optional[str],
+        by_user: bool,
+        parent_hash: str,
+        tree_hash: Optional[str] = None,
+    ) -> str:
+        """Commit one full-project snapshot on top of parent_hash and queue its pending write.
+
+        The branch is not moved and the pending writes file is not saved; callers do both
+        once they are done committing.
+
+        Args:
+            commit_file_paths: Mapping of tracked relative path to absolute path
+            tracked_file_rel_paths: Tracked relative paths, recorded with the pending write
+            prompt, response, agent_plan, by_user: Recorded with the snapshot
+            parent_hash: Parent commit
+            tree_hash: Tree of the previous snapshot when the workspace has not changed
+                since; it is reused instead of hashing every file again
+
+        Returns:
+            Commit hash, or "" on failure
+        """
+        commit_msg = self._snapshot_commit_msg(prompt, response, agent_plan, by_user)
+
+        if tree_hash:
+            commit_hash = GitManager.commit_tree(
+                self.bare_repo_path, tree_hash, commit_msg, parent_hash
+            )
+        else:
+            commit_hash = GitManager.write_blob_to_bare_repo(
+                self.bare_repo_path, commit_file_paths, commit_msg, parent_hash
+            )
+        if not commit_hash:
+            return ""
+
+        # Add to pending writes (will be synced later via mem sync)
+        self._add_to_pending_writes(
+            operation_type="snap",
+            commit_hash=commit_hash,
+            prompt=prompt,
+            response=response,
+            agent_plan=agent_plan,
+            by_user=by_user,
+            files=tracked_file_rel_paths,
+            parent_hash=parent_hash,
+            persist=False,
+        )
+        return commit_hash
+
     def create_prompt_only_commit(
         self,
         prompt: Optional[str] = None,
@@ -899,13 +1057,22 @@ class MemovManager:
                 - author: Commit author
                 - diff: Dict mapping file paths to their diff/hunk content (if include_diff=True)
         """
-        result = []
+        return list(self.iter_history(limit=limit, include_diff=include_diff, diff_mode=diff_mode))
+
+    def iter_history(
+        self, limit: int = 20, include_diff: bool = True, diff_mode: str = "full"
+    ) -> Iterator[dict]:
+        """Lazily yield history entries, same shape and order as get_history.
+
+        Per-commit work (file listing, full diffs) is only done for entries that
+        are actually consumed, so callers looking for a single commit can stop early.
+        """
         try:
             # Load branches from the memov repo
             branches = self._load_branches()
             if branches is None:
                 LOGGER.warning("No branches found in the memov repo.")
-                return []
+                return
 
             # Get the head commit
             head_commit = GitManager.get_commit_id_by_ref(
@@ -928,20 +1095,23 @@ class MemovManager:
             # Process commits (most recent first, limited)
             all_commits = all_commits[-limit:] if len(all_commits) > limit else all_commits
 
-            # Batch fetch all commit info in one call (message, timestamp, author)
-            commits_info = GitManager.get_commits_info_batch(self.bare_repo_path, all_commits)
-
-            # Batch fetch all notes in one call
-            all_notes = GitManager.get_all_notes_batch(self.bare_repo_path)
-
-            # Batch fetch files for all commits
-            all_files = GitManager.get_files_by_commits_batch(self.bare_repo_path, all_commits)
-
-            # Batch fetch diff status if needed
+            # The batch git queries below are independent subprocesses, so run them
+            # concurrently: commit info (message, timestamp, author), notes, diff status
             effective_diff_mode = diff_mode if include_diff else "none"
-            all_diff_status = {}
-            if effective_diff_mode == "status":
-                all_diff_status = GitManager.get_diff_status_batch(self.bare_repo_path, all_commits)
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                info_future = executor.submit(
+                    GitManager.get_commits_info_batch, self.bare_repo_path, all_commits
+                )
+                notes_future = executor.submit(GitManager.get_all_notes_batch, self.bare_repo_path)
+                diff_status_future = None
+                if effective_diff_mode == "status":
+                    diff_status_future = executor.submit(
+                        GitManager.get_diff_status_batch, self.bare_repo_path, all_commits
+                    )
+
+                commits_info = info_future.result()
+                all_notes = notes_future.result()
+                all_diff_status = diff_status_future.result() if diff_status_future else {}
 
             for hash_id in all_commits:
                 # Get commit info from batch result
@@ -966,8 +1136,10 @@ class MemovManager:
                     if note_parsed["agent_plan"]:
                         agent_plan = note_parsed["agent_plan"]
 
-                # Get files from batch result
-                file_rel_paths = all_files.get(hash_id, [])
+                # Get files lazily so early-exiting consumers skip the ls-tree call
+                file_rel_paths = GitManager.get_files_by_commits_batch(
+                    self.bare_repo_path, [hash_id]
+                ).get(hash_id, [])
 
                 # Get diff information based on diff_mode
                 diff_data = {}
@@ -994,13 +1166,11 @@ class MemovManager:
                 }
                 if effective_diff_mode != "none":
                     entry["diff"] = diff_data
-                result.append(entry)
+                yield entry
 
         except Exception as e:
             LOGGER.error(f"Error getting history from memov repo: {e}")
 
-        return result
-
     def _get_commit_info(self, commit_hash: str) -> dict:
         """Get commit info (timestamp, author) for a specific commit."""
         from memov.core.git import subprocess_call
@@ -1948,12 +2118,11 @@ class MemovManager:
         lines = content.splitlines()
         current_key = None
         current_lines = []
-        labels = {"Prompt:": "prompt", "Response:": "response", "Agent Plan:": "agent_plan"}
 
         for line in lines:
             # Check if line starts with any label
             found_label = None
-            for label, key in labels.items():
+            for label, key in _NOTE_LABELS:
                 if line.startswith(label):
                     found_label = label
                     # Save previous section if any
@@ -2009,6 +2178,8 @@ class MemovManager:
         agent_plan: Optional[str],
         by_user: bool,
         files: list[str],
+        parent_hash: Optional[str] = None,
+        persist: bool = True,
     ) -> None:
         """
         Add operation data to pending writes cache (in-memory).
@@ -2024,15 +2195,17 @@ class MemovManager:
             agent_plan: Agent plan (high-level summary of changes)
             by_user: Whether operation was initiated by user
             files: List of affected file paths
+            parent_hash: Parent commit, when the caller already knows it (skips a HEAD lookup)
+            persist: Save the pending writes file now; batch callers save once at the end
         """
         try:
             # Get parent commit
-            parent_hash = None
-            head_commit = GitManager.get_commit_id_by_ref(
-                self.bare_repo_path, "refs/memov/HEAD", verbose=False
-            )
-            if head_commit and head_commit != commit_hash:
-                parent_hash = head_commit
+            if parent_hash is None:
+                head_commit = GitManager.get_commit_id_by_ref(
+                    self.bare_repo_path, "refs/memov/HEAD", verbose=False
+                )
+                if head_commit and head_commit != commit_hash:
+                    parent_hash = head_commit
 
             # Add to pending writes
             self._pending_writes.append(
@@ -2055,7 +2228,8 @@ class MemovManager:
             )
 
             # Save to disk for persistence across CLI invocations
-            self._save_pending_writes()
+            if persist:
+                self._save_pending_writes()
 
         except Exception as e:
             LOGGER.warning(f"Failed to add to pending writes: {e}")
@@ -2080,6 +2254,7 @@ class MemovManager:
         successful = 0
         failed = 0
 
+        entries = []
         for write_data in self._pending_writes:
             try:
                 # Prepare base metadata
@@ -2091,22 +2266,35 @@ class MemovManager:
                     "parent_hash": write_data.get("parent_hash", ""),
                     "timestamp": write_data["timestamp"],
                 }
-
-                # Use splitted insertion for independent retrieval
-                self.vectordb.insert_splitted(
-                    commit_hash=write_data["commit_hash"],
-                    prompt=write_data.get("prompt"),
-                    response=write_data.get("response"),
-                    agent_plan=write_data.get("agent_plan"),
-                    metadata=metadata,
-                )
-
-                LOGGER.debug(f"Synced commit {write_data['commit_hash']} to VectorDB")
-                successful += 1
-
             except Exception as e:
-                LOGGER.warning(f"Failed to sync commit {write_data['commit_hash']}: {e}")
+                LOGGER.warning(f"Skipping malformed pending write {write_data}: {e}")
                 failed += 1
+                continue
+            entries.append(
+                {
+                    "commit_hash": write_data["commit_hash"],
+                    "prompt": write_data.get("prompt"),
+                    "response": write_data.get("response"),
+                    "agent_plan": write_data.get("agent_plan"),
+                    "metadata": metadata,
+                }
+            )
+
+        try:
+            # Single embedding + write round-trip for all pending commits
+            self.vectordb.insert_splitted_batch(entries)
+            successful = len(entries)
+        except Exception as e:
+            LOGGER.warning(f"Batch sync failed ({e}), retrying commits individually")
+            for entry in entries:
+                try:
+                    # Use splitted insertion for independent retrieval
+                    self.vectordb.insert_splitted(**entry)
+                    LOGGER.debug(f"Synced commit {entry['commit_hash']} to VectorDB")
+                    successful += 1
+                except Exception as e:
+                    LOGGER.warning(f"Failed to sync commit {entry['commit_hash']}: {e}")
+                    failed += 1
 
         # Clear pending writes after sync
         self._pending_writes.clear()
@@ -0,0 +1,168 @@
+"""
+Persistent cache of query embeddings.
+
+Debug queries repeat across sessions: the same error message and the same top stack
+frames come back every time a bug reproduces. EmbeddingCache stores each embedded
+query text in a small SQLite file, so a repeated query skips the embedding model (or
+the embeddings API round trip) even after a restart.
+"""
+
+import hashlib
+import logging
+import os
+import platform
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _get_cache_dir() -> Path:
+    """Get platform-appropriate cache directory."""
+    if platform.system() == "Windows":
+        # Use LOCALAPPDATA on Windows
+        local_appdata = os.environ.get("LOCALAPPDATA")
+        if local_appdata:
+            return Path(local_appdata) / "memov" / "cache"
+        return Path.home() / ".memov" / "cache"
+    else:
+        # Use XDG_CACHE_HOME or ~/.cache on Unix
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        if xdg_cache:
+            return Path(xdg_cache) / "memov"
+        return Path.home() / ".cache" / "memov"
+
+
+class EmbeddingCache:
+    """Thread-safe SQLite cache mapping (embedding model, text) to its embedding vector."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 10000,
+        ttl_seconds: float = 30 * 24 * 3600,
+    ):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite database file
+            max_entries: Maximum number of cached embeddings (least recently used are evicted)
+            ttl_seconds: Seconds before an entry expires
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+            )
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Key for a text embedded by a given model; vectors from different models never mix."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Return the cached vector for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector, created_at FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE embeddings SET last_used = ? WHERE key = ?", (now, key))
+
+        return array("f", row[0]).tolist()
+
+    def put(self, key: str, vector: Sequence[float]) -> None:
+        """Store a vector (as float32), evicting the least recently used entries if full."""
+        now = time.time()
+        blob = array("f", vector).tobytes()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                "SELECT key FROM embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Drop every cached embedding."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM embeddings")
+
+
+_EMBEDDING_CACHE: Optional[EmbeddingCache] = None
+_EMBEDDING_CACHE_LOCK = threading.Lock()
+_EMBEDDING_CACHE_FAILED = False
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide embedding cache, or None if its file cannot be opened."""
+    global _EMBEDDING_CACHE, _EMBEDDING_CACHE_FAILED
+
+    with _EMBEDDING_CACHE_LOCK:
+        if _EMBEDDING_CACHE is None and not _EMBEDDING_CACHE_FAILED:
+            try:
+                _EMBEDDING_CACHE = EmbeddingCache(_get_cache_dir() / "embed_cache.sqlite")
+            except (OSError, sqlite3.Error) as e:
+                # e.g. read-only home directory; embed without caching
+                logger.warning(f"Embedding cache disabled: {e}")
+                _EMBEDDING_CACHE_FAILED = True
+        return _EMBEDDING_CACHE
+
+
+def embed_query_with_cache(vectordb, query_text: str) -> List[float]:
+    """
+    Embed a query with vectordb, reusing an embedding computed earlier for the same text.
+
+    Args:
+        vectordb: VectorDB whose embedding function produces the vector
+        query_text: Text to embed
+
+    Returns:
+        Query embedding
+    """
+    cache = get_embedding_cache()
+    if cache is None:
+        return vectordb.embed_query(query_text)
+
+    key = cache.make_key(vectordb.embedding_id, query_text)
+    try:
+        vector = cache.get(key)
+    except sqlite3.Error as e:
+        logger.warning(f"Embedding cache read failed: {e}")
+        return vectordb.embed_query(query_text)
+    if vector is not None:
+        return vector
+
+    vector = vectordb.embed_query(query_text)
+    try:
+        cache.put(key, vector)
+    except sqlite3.Error as e:
+        logger.warning(f"Embedding cache write failed: {e}")
+    return vector
@@ -6,9 +6,11 @@ using LiteLLM, supporting OpenAI, Anthropic, Google, and other providers.
 """
 
 import asyncio
+import functools
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, TypeVar
 
 try:
     import litellm
@@ -19,6 +21,36 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=1)
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Start the process-wide event loop that sync callers schedule LLM coroutines onto.
+
+    The loop lives on a daemon thread for the rest of the process, so the async HTTP
+    clients LiteLLM creates and caches (connection pool, TLS sessions) stay bound to a
+    live loop between calls instead of one that a fresh ``asyncio.run`` closes each time.
+
+    No process-wide ``litellm.aclient_session`` is set here: async callers may await
+    LLMClient coroutines on their own loop, and an httpx pool bound to this loop would
+    fail there.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="llm-client-loop", daemon=True).start()
+    return loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the shared background loop and block until it finishes.
+
+    Safe to call from threads that already run an event loop (e.g. sync MCP tools),
+    where ``asyncio.run`` would raise.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
 
 class LLMClient:
     """Client for querying multiple LLM models via LiteLLM."""
@@ -246,6 +278,43 @@ class LLMClient:
 
         return formatted_results
 
+    async def iter_multiple_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        models: Optional[List[str]] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Query multiple models in parallel, yielding each response as soon as it finishes.
+
+        Unlike query_multiple_async, a slow model does not hold back the others; responses
+        arrive in completion order, not model order.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            models: List of model names (default: self.models)
+            **kwargs: Additional parameters
+
+        Yields:
+            Response dictionaries
+        """
+        target_models = models or self.models
+
+        tasks = [
+            asyncio.ensure_future(self.query_single_async(model, prompt, system_prompt, **kwargs))
+            for model in target_models
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: don't leave requests running
+            for task in tasks:
+                task.cancel()
+
     def compare_responses(
         self,
         responses: List[Dict[str, Any]],
@@ -0,0 +1,162 @@
+"""
+Semantic cache for RAG searches.
+
+Debug traffic is dominated by near-duplicate queries (the same error message with
+a different line number, a retried tool call, ...). SimilarityCache keeps recent
+search results keyed by the query embedding and serves any later query whose
+embedding is close enough, skipping the vector search entirely.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class SimilarityCache:
+    """Thread-safe LRU cache of search results, matched by cosine similarity of embeddings."""
+
+    def __init__(
+        self,
+        max_size: int = 2000,
+        ttl_seconds: float = 600,
+        threshold: float = 0.97,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached queries (least recently used are evicted)
+            ttl_seconds: Seconds before an entry expires; also bounds staleness from
+                writes made by other processes, which the generation check cannot see
+            threshold: Minimum cosine similarity for a cached query to count as a hit
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+
+        self._lock = threading.RLock()
+        # key -> (unit embedding, scope, generation, created_at, results)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_key = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether lookups can run (they need numpy)."""
+        return NUMPY_AVAILABLE
+
+    def lookup(
+        self,
+        embedding: Sequence[float],
+        scope: tuple,
+        generation: int,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached results for a similar query, or None on a miss.
+
+        Args:
+            embedding: Query embedding
+            scope: Everything besides the query that shaped the results (database,
+                content types, n_results); only entries with an equal scope match
+            generation: Current VectorDB generation; older entries are ignored
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+
+        query = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            keys = []
+            vectors = []
+            for key, (vector, entry_scope, entry_generation, created_at, _) in list(
+                self._entries.items()
+            ):
+                if now - created_at > self.ttl_seconds:
+                    del self._entries[key]
+                    continue
+                if entry_scope != scope:
+                    continue
+                if entry_generation != generation:
+                    # Cached before the collection last changed
+                    del self._entries[key]
+                    continue
+                if vector.shape == query.shape:
+                    keys.append(key)
+                    vectors.append(vector)
+
+            if keys:
+                similarities = np.stack(vectors) @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    key = keys[best]
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return self._entries[key][4]
+
+            self._misses += 1
+            return None
+
+    def store(
+        self,
+        embedding: Sequence[float],
+        scope: tuple,
+        generation: int,
+        results: List[Dict[str, Any]],
+    ) -> None:
+        """Cache results for a query (see lookup for the arguments)."""
+        if not NUMPY_AVAILABLE:
+            return
+
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._entries[self._next_key] = (vector, scope, generation, time.monotonic(), results)
+            self._next_key += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return size and hit-rate counters for telemetry."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> "np.ndarray":
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+# Shared across RAGDebugger instances: callers build a new debugger per request
+_SIMILARITY_CACHE = SimilarityCache()
+
+
+def get_similarity_cache() -> SimilarityCache:
+    """Return the process-wide similarity cache used by RAGDebugger."""
+    return _SIMILARITY_CACHE
@@ -7,21 +7,94 @@ This module combines:
 3. Multi-model LLM querying to get diverse debugging insights
 """
 
+import asyncio
+import io
 import logging
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from memov.core.git import GitManager
 from memov.core.manager import MemovManager
-from memov.debugging.llm_client import LLMClient
+from memov.debugging.embedding_cache import embed_query_with_cache
+from memov.debugging.llm_client import LLMClient, run_sync
+from memov.debugging.query_cache import get_similarity_cache
 
 logger = logging.getLogger(__name__)
 
+# "Label: value" lines in commit messages / git notes, matched in one pass over the text
+_HEADER_RE = re.compile(r"^(Prompt|Response|Agent Plan):(.*)$", re.M)
+_HEADER_KEYS = {"Prompt": "prompt", "Response": "response", "Agent Plan": "agent_plan"}
 
-@dataclass
+# Numbered ("1. ", "12. ") or bulleted ("- ", "* ") lines, captured without surrounding whitespace
+_REC_RE = re.compile(r"^[^\S\n]*((?:\d.{0,2}\. |[-*] ).*?\S)[^\S\n]*$", re.M)
+
+# Per-commit caps for commit details kept in a DebugContext; the prompt only shows
+# the first files of a commit and never its raw message
+_CONTEXT_MAX_FILES = 5
+_CONTEXT_MAX_MESSAGE_CHARS = 1024
+
+# Prompt size caps (characters): each free-text input, and the whole formatted context.
+# Input tokens drive both LLM latency and cost, and a pasted 100 KB trace adds little
+_PROMPT_MAX_FIELD_CHARS = 4096
+_PROMPT_MAX_CONTEXT_CHARS = 16384
+_TRUNCATION_MARKER = "\n... [truncated] ...\n"
+
+
+def _parse_headers(text: str) -> Dict[str, str]:
+    """Map header keys to their stripped values; later lines win, like a line-by-line scan."""
+    return {_HEADER_KEYS[label]: value.strip() for label, value in _HEADER_RE.findall(text)}
+
+
+def _build_commit_details(
+    commit_hash: str, commit_msg: str, files: List[str], note_content: Optional[str]
+) -> Dict[str, Any]:
+    """Assemble a get_commit_details result; note lines may override prompt and response."""
+    fields = _parse_headers(commit_msg)
+    if note_content:
+        note_fields = _parse_headers(note_content)
+        fields.update(
+            (key, note_fields[key]) for key in ("prompt", "response") if key in note_fields
+        )
+
+    return {
+        "commit_hash": commit_hash,
+        "message": commit_msg,
+        "files": list(files),
+        "prompt": fields.get("prompt"),
+        "response": fields.get("response"),
+        "agent_plan": fields.get("agent_plan"),
+    }
+
+
+def _truncate_middle(text: str, max_chars: int = _PROMPT_MAX_FIELD_CHARS) -> str:
+    """Cut text to max_chars keeping its head and tail; tracebacks end in the frames that matter."""
+    if len(text) <= max_chars:
+        return text
+    half = (max_chars - len(_TRUNCATION_MARKER)) // 2
+    return text[:half] + _TRUNCATION_MARKER + text[-half:]
+
+
+@lru_cache(maxsize=1024)
+def _commit_message_and_files(bare_repo_path: str, commit_hash: str) -> tuple:
+    """Commit message and file list, cached: both are fixed by the commit hash.
+
+    Git notes are not cached since they can be rewritten after the commit.
+    """
+    commit_msg = GitManager.get_commit_message(bare_repo_path, commit_hash)
+    if not commit_msg:
+        # Lookup failed (already logged); raise so the failure is not cached
+        raise LookupError(f"Commit {commit_hash} not found")
+    files, _ = GitManager.get_files_by_commit(bare_repo_path, commit_hash)
+    return commit_msg, tuple(files)
+
+
+@dataclass(slots=True)
 class DebugContext:
     """Context information for debugging."""
+
     error_message: Optional[str] = None
     stack_trace: Optional[str] = None
     user_logs: Optional[str] = None
@@ -29,9 +102,10 @@ class DebugContext:
     code_snippets: List[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DebugResult:
     """Result from multi-model debugging analysis."""
+
     query: str
     context: DebugContext
     llm_responses: List[Dict[str, Any]]
@@ -89,23 +163,36 @@ class RAGDebugger:
             List of relevant documents from VectorDB
         """
         try:
+            # Embed once: the vector keys the similarity cache and feeds the search below.
+            # Repeated queries (same error, same stack frames) reuse a persisted embedding
+            cache = get_similarity_cache()
+            embedding = embed_query_with_cache(self.vectordb, query)
+            scope = (
+                self.vectordb.store_key,
+                frozenset(content_types or ()),
+                n_results,
+            )
+            generation = self.vectordb.generation
+            cached = cache.lookup(embedding, scope, generation)
+            if cached is not None:
+                return cached
+
             if content_types:
-                # Search across multiple content types
-                all_results = []
-                for content_type in content_types:
-                    results = self.vectordb.search_by_content_type(
-                        query_text=query,
-                        content_type=content_type,
-                        n_results=n_results,
-                    )
-                    all_results.extend(results)
-
-                # Sort by distance and take top n_results
-                all_results.sort(key=lambda x: x.get("distance", float("inf")))
-                return all_results[:n_results]
+                # One filtered query; Chroma already returns the top n_results by distance
+                results = self.vectordb.search_by_content_types(
+                    query_text=query,
+                    content_types=content_types,
+                    n_results=n_results,
+                    query_embedding=embedding,
+                )
             else:
                 # Default: search all content
-                return self.vectordb.search(query_text=query, n_results=n_results)
+                results = self.vectordb.search(
+                    query_text=query, n_results=n_results, query_embedding=embedding
+                )
+
+            cache.store(embedding, scope, generation, results)
+            return results
 
         except Exception as e:
             logger.error(f"Error searching relevant code: {e}")
@@ -122,39 +209,13 @@ class RAGDebugger:
             Dictionary with commit details
         """
         try:
-            # Get commit message
-            commit_msg = GitManager.get_commit_message(self.bare_repo_path, commit_hash)
-
-            # Get files changed
-            files, _ = GitManager.get_files_by_commit(self.bare_repo_path, commit_hash)
-
-            # Parse commit message for metadata
-            prompt = response = agent_plan = None
-            for line in commit_msg.splitlines():
-                if line.startswith("Prompt:"):
-                    prompt = line[len("Prompt:"):].strip()
-                elif line.startswith("Response:"):
-                    response = line[len("Response:"):].strip()
-                elif line.startswith("Agent Plan:"):
-                    agent_plan = line[len("Agent Plan:"):].strip()
+            # Get commit message and files changed
+            commit_msg, files = _commit_message_and_files(self.bare_repo_path, commit_hash)
 
             # Check git notes
             note_content = GitManager.get_commit_note(self.bare_repo_path, commit_hash)
-            if note_content:
-                for line in note_content.splitlines():
-                    if line.startswith("Prompt:"):
-                        prompt = line[len("Prompt:"):].strip()
-                    elif line.startswith("Response:"):
-                        response = line[len("Response:"):].strip()
-
-            return {
-                "commit_hash": commit_hash,
-                "message": commit_msg,
-                "files": files,
-                "prompt": prompt,
-                "response": response,
-                "agent_plan": agent_plan,
-            }
+
+            return _build_commit_details(commit_hash, commit_msg, files, note_content)
 
         except Exception as e:
             logger.error(f"Error getting commit details: {e}")
@@ -167,6 +228,7 @@ class RAGDebugger:
         stack_trace: Optional[str] = None,
         user_logs: Optional[str] = None,
         n_results: int = 5,
+        snippet_limit: int = 3,
     ) -> DebugContext:
         """
         Build comprehensive debugging context using RAG.
@@ -177,20 +239,25 @@ class RAGDebugger:
             stack_trace: Stack trace if available
             user_logs: User logs if available
             n_results: Number of relevant commits to retrieve
+            snippet_limit: Number of search results and commits kept in the context
 
         Returns:
             DebugContext with all gathered information
         """
-        # Combine query components for search
-        search_query_parts = [query]
-        if error_message:
-            search_query_parts.append(error_message)
-        if stack_trace:
-            # Extract key parts from stack trace
-            stack_lines = stack_trace.splitlines()[:5]  # First 5 lines
-            search_query_parts.extend(stack_lines)
+        # Combine query components for search; a bare query is used as-is
+        if not error_message and not stack_trace:
+            search_query = query
+        else:
+            search_query_parts = [query]
+            if error_message:
+                search_query_parts.append(error_message)
+            if stack_trace:
+                # Extract key parts from stack trace
+                # First 5 lines; maxsplit stops splitting there instead of splitting the whole trace
+                stack_lines = [line.rstrip("\r") for line in stack_trace.split("\n", 5)[:5]]
+                search_query_parts.extend(stack_lines)
 
-        search_query = "\n".join(search_query_parts)
+            search_query = "\n".join(search_query_parts)
 
         # Search for relevant code
         search_results = self.search_relevant_code(
@@ -199,24 +266,45 @@ class RAGDebugger:
             content_types=["prompt", "response", "agent_plan"],
         )
 
-        # Get commit details for top results
-        relevant_commits = []
-        seen_commits = set()
-
+        # Dedupe commit hashes up front, scoring each commit by its closest hit, in one pass
+        distances = {}
         for result in search_results:
             commit_hash = result.get("metadata", {}).get("commit_hash")
-            if commit_hash and commit_hash not in seen_commits:
+            if commit_hash:
+                distance = result.get("distance", 1.0)
+                if distance < distances.get(commit_hash, distance + 1):
+                    distances[commit_hash] = distance
+
+        # Only the closest commits are kept
+        commit_hashes = sorted(distances, key=distances.__getitem__)[:snippet_limit]
+
+        # One batched git walk for all commits instead of three git calls per commit
+        bundle = GitManager.get_commit_bundle(self.bare_repo_path, commit_hashes)
+
+        relevant_commits = []
+        for commit_hash in commit_hashes:
+            if commit_hash in bundle:
+                entry = bundle[commit_hash]
+                commit_details = _build_commit_details(
+                    commit_hash, entry["message"], entry["files"], entry["note"]
+                )
+            else:
+                # Not resolved by the batch; the single lookup reports the error
                 commit_details = self.get_commit_details(commit_hash)
-                commit_details["relevance_score"] = 1.0 - result.get("distance", 1.0)
-                relevant_commits.append(commit_details)
-                seen_commits.add(commit_hash)
+            # Headers are already parsed; drop the bulk the prompt never reads
+            if commit_details.get("files"):
+                commit_details["files"] = commit_details["files"][:_CONTEXT_MAX_FILES]
+            if commit_details.get("message"):
+                commit_details["message"] = commit_details["message"][:_CONTEXT_MAX_MESSAGE_CHARS]
+            commit_details["relevance_score"] = 1.0 - distances[commit_hash]
+            relevant_commits.append(commit_details)
 
         return DebugContext(
             error_message=error_message,
             stack_trace=stack_trace,
             user_logs=user_logs,
             relevant_commits=relevant_commits,
-            code_snippets=search_results,
+            code_snippets=search_results[:snippet_limit],
         )
 
     def format_context_for_llm(self, context: DebugContext) -> str:
@@ -229,51 +317,49 @@ class RAGDebugger:
         Returns:
             Formatted context string
         """
-        lines = []
+        # Written straight into one buffer: no per-line list, one final string.
+        # Every line ends in "\n"; the last one is dropped to match a "\n".join of lines.
+        buf = io.StringIO()
+        w = buf.write
 
-        # Error information
+        # Error information, each field capped so one huge paste cannot dominate the prompt
         if context.error_message:
-            lines.append("## Error Message")
-            lines.append(context.error_message)
-            lines.append("")
+            w("## Error Message\n")
+            w(_truncate_middle(context.error_message))
+            w("\n\n")
 
         if context.stack_trace:
-            lines.append("## Stack Trace")
-            lines.append("```")
-            lines.append(context.stack_trace)
-            lines.append("```")
-            lines.append("")
+            w("## Stack Trace\n```\n")
+            w(_truncate_middle(context.stack_trace))
+            w("\n```\n\n")
 
         if context.user_logs:
-            lines.append("## User Logs")
-            lines.append("```")
-            lines.append(context.user_logs)
-            lines.append("```")
-            lines.append("")
+            w("## User Logs\n```\n")
+            w(_truncate_middle(context.user_logs))
+            w("\n```\n\n")
 
         # Relevant code context from RAG
         if context.relevant_commits:
-            lines.append("## Relevant Code Changes (from history)")
-            lines.append("")
+            w("## Relevant Code Changes (from history)\n\n")
 
             for i, commit in enumerate(context.relevant_commits[:3], 1):
-                lines.append(f"### [{i}] Commit {commit.get('commit_hash', 'unknown')[:8]}")
-                lines.append(f"**Relevance:** {commit.get('relevance_score', 0):.2f}")
-                lines.append("")
+                if buf.tell() >= _PROMPT_MAX_CONTEXT_CHARS:
+                    break
+                w("### [%d] Commit %s\n" % (i, commit.get("commit_hash", "unknown")[:8]))
+                w("**Relevance:** %.2f\n\n" % commit.get("relevance_score", 0))
 
                 if commit.get("prompt"):
-                    lines.append(f"**Original Prompt:** {commit['prompt'][:200]}")
-                    lines.append("")
+                    w("**Original Prompt:** %s\n\n" % commit["prompt"][:200])
 
                 if commit.get("agent_plan"):
-                    lines.append(f"**Changes Made:** {commit['agent_plan'][:300]}")
-                    lines.append("")
+                    w("**Changes Made:** %s\n\n" % commit["agent_plan"][:300])
 
                 if commit.get("files"):
-                    lines.append(f"**Files Modified:** {', '.join(commit['files'][:5])}")
-                    lines.append("")
+                    w("**Files Modified:** %s\n\n" % ", ".join(commit["files"][:5]))
 
-        return "\n".join(lines)
+        if buf.tell():
+            buf.truncate(buf.tell() - 1)
+        return buf.getvalue()[:_PROMPT_MAX_CONTEXT_CHARS]
 
     def debug_with_llm(
         self,
@@ -285,11 +371,38 @@ class RAGDebugger:
         """
         Analyze debug issue using multiple LLMs.
 
+        Sync wrapper around `adebug_with_llm`; the coroutine runs on the shared
+        background event loop, so HTTP sessions are reused across calls.
+
+        Args:
+            query: Debug query
+            context: Debug context
+            models: List of models to query (optional)
+            use_async: Whether to use async parallel querying
+
+        Returns:
+            DebugResult with responses from all models
+        """
+        return run_sync(self.adebug_with_llm(query, context, models, use_async))
+
+    async def adebug_with_llm(
+        self,
+        query: str,
+        context: DebugContext,
+        models: Optional[List[str]] = None,
+        use_async: bool = True,
+        on_response: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> DebugResult:
+        """
+        Async version of debug_with_llm.
+
         Args:
             query: Debug query
             context: Debug context
             models: List of models to query (optional)
             use_async: Whether to use async parallel querying
+            on_response: Called with each model response as soon as it arrives
+                (async mode), before the full result is assembled
 
         Returns:
             DebugResult with responses from all models
@@ -315,7 +428,7 @@ Your task is to analyze the provided error information, code context, and histor
 
 Be concise, specific, and actionable in your response."""
 
-        full_prompt = f"""Debug Query: {query}
+        full_prompt = f"""Debug Query: {_truncate_middle(query)}
 
 {context_str}
 
@@ -327,17 +440,29 @@ Please provide:
 
         # Query models
         try:
-            if use_async:
-                import asyncio
-                responses = asyncio.run(
-                    self.llm_client.query_multiple_async(
-                        prompt=full_prompt,
-                        system_prompt=system_prompt,
-                        models=models,
-                    )
+            if use_async and on_response:
+                # Hand each response over as it lands instead of after the slowest model
+                responses = []
+                async for response in self.llm_client.iter_multiple_async(
+                    prompt=full_prompt,
+                    system_prompt=system_prompt,
+                    models=models,
+                ):
+                    on_response(response)
+                    responses.append(response)
+                # Back to model order, as query_multiple_async returns them
+                order = {model: i for i, model in enumerate(models or self.llm_client.models)}
+                responses.sort(key=lambda r: order.get(r.get("model"), len(order)))
+            elif use_async:
+                responses = await self.llm_client.query_multiple_async(
+                    prompt=full_prompt,
+                    system_prompt=system_prompt,
+                    models=models,
                 )
             else:
-                responses = self.llm_client.query_multiple(
+                # Sequential blocking calls; keep them off the shared loop
+                responses = await asyncio.to_thread(
+                    self.llm_client.query_multiple,
                     prompt=full_prompt,
                     system_prompt=system_prompt,
                     models=models,
@@ -366,9 +491,80 @@ Please provide:
                 recommendations=[f"Error: {str(e)}"],
             )
 
-    def _extract_recommendations(
-        self, responses: List[Dict[str, Any]]
-    ) -> List[str]:
+    async def asearch_relevant_code(
+        self,
+        query: str,
+        n_results: int = 5,
+        content_types: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of search_relevant_code.
+
+        The embedding and vector search are blocking, so they run in a worker thread and
+        leave the event loop free for in-flight LLM requests.
+        """
+        return await asyncio.to_thread(self.search_relevant_code, query, n_results, content_types)
+
+    async def abuild_debug_context(
+        self,
+        query: str,
+        error_message: Optional[str] = None,
+        stack_trace: Optional[str] = None,
+        user_logs: Optional[str] = None,
+        n_results: int = 5,
+        snippet_limit: int = 3,
+    ) -> DebugContext:
+        """Async version of build_debug_context (RAG search and git reads in a worker thread)."""
+        return await asyncio.to_thread(
+            self.build_debug_context,
+            query,
+            error_message,
+            stack_trace,
+            user_logs,
+            n_results,
+            snippet_limit,
+        )
+
+    async def adebug(
+        self,
+        query: str,
+        error_message: Optional[str] = None,
+        stack_trace: Optional[str] = None,
+        user_logs: Optional[str] = None,
+        n_results: int = 5,
+        models: Optional[List[str]] = None,
+        on_response: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> DebugResult:
+        """
+        Build the debug context and analyze it with every model, without blocking the loop.
+
+        Within one call the stages run in sequence: every model request needs the finished
+        context prompt, so retrieval cannot overlap the LLM calls. The gain is across calls:
+        several debug sessions can share one event loop, and while one waits on the vector
+        search or git in a worker thread, the others keep their LLM requests moving.
+
+        Args:
+            query: Debug query
+            error_message: Error message if available
+            stack_trace: Stack trace if available
+            user_logs: User logs if available
+            n_results: Number of relevant commits to retrieve
+            models: List of models to query (optional)
+            on_response: Called with each model response as soon as it arrives
+
+        Returns:
+            DebugResult with responses from all models
+        """
+        context = await self.abuild_debug_context(
+            query,
+            error_message=error_message,
+            stack_trace=stack_trace,
+            user_logs=user_logs,
+            n_results=n_results,
+        )
+        return await self.adebug_with_llm(query, context, models, on_response=on_response)
+
+    def _extract_recommendations(self, responses: List[Dict[str, Any]]) -> List[str]:
         """Extract actionable recommendations from LLM responses."""
         recommendations = []
 
@@ -378,46 +574,31 @@ Please provide:
                 continue
 
             # Look for numbered lists or bullet points
-            lines = content.splitlines()
-            for line in lines:
-                line = line.strip()
-                # Match patterns like "1.", "2.", "-", "*"
-                if line and (
-                    line[0].isdigit() and ". " in line[:5]
-                    or line.startswith("- ")
-                    or line.startswith("* ")
-                ):
-                    recommendations.append(line)
+            recommendations.extend(_REC_RE.findall(content))
+            if len(recommendations) >= 10:
+                break
 
         return recommendations[:10]  # Top 10 recommendations
 
-    def _generate_consensus(
-        self, responses: List[Dict[str, Any]]
-    ) -> Optional[str]:
+    def _generate_consensus(self, responses: List[Dict[str, Any]]) -> Optional[str]:
         """Generate consensus summary from multiple model responses."""
-        valid_responses = [r for r in responses if r.get("content")]
+        valid = [(r.get("model", "Unknown"), r["content"]) for r in responses if r.get("content")]
 
-        if len(valid_responses) < 2:
+        if len(valid) < 2:
             return None
 
         # Simple consensus: identify common themes
         # In a production system, you might use another LLM call to synthesize
-        consensus_parts = [
-            f"Analyzed by {len(valid_responses)} models:",
-        ]
-
-        for i, resp in enumerate(valid_responses, 1):
-            model = resp.get("model", "Unknown")
-            content = resp.get("content", "")
-            # First 150 chars
-            preview = content[:150] + "..." if len(content) > 150 else content
-            consensus_parts.append(f"\n[{model}]: {preview}")
-
-        return "\n".join(consensus_parts)
+        # One line per model with the first 150 chars of its answer, built in a single list
+        return "\n".join(
+            ["Analyzed by %d models:" % len(valid)]
+            + [
+                "\n[%s]: %s" % (model, content[:150] + "..." if len(content) > 150 else content)
+                for model, content in valid
+            ]
+        )
 
-    def format_debug_result(
-        self, result: DebugResult, include_full_responses: bool = True
-    ) -> str:
+    def format_debug_result(self, result: DebugResult, include_full_responses: bool = True) -> str:
         """
         Format debug result for display.
 
@@ -428,57 +609,72 @@ Please provide:
         Returns:
             Formatted string
         """
-        lines = []
-        lines.append("=" * 80)
-        lines.append("🔍 VIBE DEBUGGING REPORT")
-        lines.append("=" * 80)
-        lines.append("")
+        return "\n".join(self.iter_debug_result_lines(result, include_full_responses))
 
-        lines.append(f"Query: {result.query}")
-        lines.append("")
+    def iter_debug_result_lines(
+        self, result: DebugResult, include_full_responses: bool = True
+    ) -> Iterator[str]:
+        """
+        Yield the lines of format_debug_result one at a time.
+
+        Lets callers stream a report to a console or file as it is produced instead of
+        holding every line of a large multi-model report in a list first.
+
+        Args:
+            result: DebugResult to format
+            include_full_responses: Whether to include full LLM responses
+
+        Yields:
+            Report lines, without trailing newlines
+        """
+        yield "=" * 80
+        yield "🔍 VIBE DEBUGGING REPORT"
+        yield "=" * 80
+        yield ""
+
+        yield f"Query: {result.query}"
+        yield ""
 
         # Context summary
-        lines.append("## Context")
+        yield "## Context"
         if result.context.error_message:
-            lines.append(f"Error: {result.context.error_message[:100]}")
-        lines.append(f"Relevant commits found: {len(result.context.relevant_commits or [])}")
-        lines.append("")
+            yield f"Error: {result.context.error_message[:100]}"
+        yield f"Relevant commits found: {len(result.context.relevant_commits or [])}"
+        yield ""
 
         # Consensus
         if result.consensus:
-            lines.append("## Consensus Summary")
-            lines.append(result.consensus)
-            lines.append("")
+            yield "## Consensus Summary"
+            yield result.consensus
+            yield ""
 
         # Key Recommendations
         if result.recommendations:
-            lines.append("## Key Recommendations")
+            yield "## Key Recommendations"
             for i, rec in enumerate(result.recommendations[:5], 1):
-                lines.append(f"{i}. {rec}")
-            lines.append("")
+                yield f"{i}. {rec}"
+            yield ""
 
         # Full responses
         if include_full_responses and result.llm_responses:
-            lines.append("## Detailed Analysis by Model")
-            lines.append("")
+            yield "## Detailed Analysis by Model"
+            yield ""
 
             for resp in result.llm_responses:
                 model = resp.get("model", "Unknown")
                 content = resp.get("content")
                 error = resp.get("error")
 
-                lines.append(f"### {model}")
-                lines.append("-" * 80)
+                yield f"### {model}"
+                yield "-" * 80
 
                 if error:
-                    lines.append(f"❌ Error: {error}")
+                    yield f"❌ Error: {error}"
                 elif content:
-                    lines.append(content)
+                    yield content
                 else:
-                    lines.append("⚠️ No response")
-
-                lines.append("")
+                    yield "⚠️ No response"
 
-        lines.append("=" * 80)
+                yield ""
 
-        return "\n".join(lines)
+        yield "=" * 80
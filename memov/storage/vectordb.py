@@ -2,6 +2,7 @@
 
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -26,6 +27,14 @@ logger = logging.getLogger(__name__)
 class VectorDB:
     """Vector database wrapper for memov using ChromaDB with lightweight embedding options."""
 
+    # Write counters per persist directory, shared by every instance in this process
+    # (managers build a fresh VectorDB per call); see `generation`
+    _generations: Dict[str, int] = {}
+
+    # Process-wide instances handed out by `shared`, keyed by their constructor settings
+    _shared: Dict[tuple, "VectorDB"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(
         self,
         persist_directory: Path,
@@ -60,9 +69,13 @@ class VectorDB:
 
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(parents=True, exist_ok=True)
+        # Canonical path keying per-directory state (`generation`, `shared`), so every
+        # spelling of one directory (relative, absolute, via a symlink) shares a counter
+        self.store_key = str(self.persist_directory.resolve())
         self.collection_name = collection_name
         self.chunker = TextChunker(chunk_size=chunk_size)
         self.embedding_backend = embedding_backend
+        self.embedding_model = embedding_model
 
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
@@ -87,6 +100,48 @@ class VectorDB:
             f"with collection '{self.collection_name}' using '{embedding_backend}' backend"
         )
 
+    @classmethod
+    def shared(
+        cls,
+        persist_directory: Path,
+        collection_name: str = "memov_memories",
+        chunk_size: int = 768,
+        embedding_backend: str = "default",
+        embedding_model: Optional[str] = None,
+        openai_api_key: Optional[str] = None,
+    ) -> "VectorDB":
+        """
+        Return the process-wide VectorDB for these settings, creating it on first use.
+
+        Opening the Chroma client, resolving the collection and loading the embedding
+        model then happen once per process rather than once per MemovManager (the MCP
+        server and web UI build a new manager for every request).
+
+        Args:
+            Same as __init__
+        """
+        key = (
+            str(Path(persist_directory).resolve()),
+            collection_name,
+            chunk_size,
+            embedding_backend,
+            embedding_model,
+            openai_api_key,
+        )
+        with cls._shared_lock:
+            instance = cls._shared.get(key)
+            if instance is None:
+                instance = cls(
+                    persist_directory=persist_directory,
+                    collection_name=collection_name,
+                    chunk_size=chunk_size,
+                    embedding_backend=embedding_backend,
+                    embedding_model=embedding_model,
+                    openai_api_key=openai_api_key,
+                )
+                cls._shared[key] = instance
+            return instance
+
     def _create_embedding_function(
         self,
         backend: str,
@@ -162,6 +217,31 @@ class VectorDB:
                 f"Choose from: default, fastembed, openai, sentence-transformers"
             )
 
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every write this process makes to the collection.
+
+        Lets callers holding cached search results detect that they may be stale.
+        """
+        return VectorDB._generations.get(self.store_key, 0)
+
+    def _bump_generation(self) -> None:
+        VectorDB._generations[self.store_key] = VectorDB._generations.get(self.store_key, 0) + 1
+
+    @property
+    def embedding_id(self) -> str:
+        """Identifies the embedding backend and model; vectors are only comparable within one."""
+        return f"{self.embedding_backend}:{self.embedding_model or ''}"
+
+    def embed_query(self, query_text: str) -> List[float]:
+        """
+        Embed a query with the collection's embedding function.
+
+        The result can be passed to `search(query_embedding=...)` to reuse one
+        embedding across several searches.
+        """
+        return list(self.embedding_function([query_text])[0])
+
     def insert(
         self,
         text: str,
@@ -185,6 +265,26 @@ class VectorDB:
         Returns:
             List of inserted document IDs
         """
+        ids, documents, metadatas = self._prepare_chunks(text, metadata, doc_id)
+
+        # Insert into ChromaDB
+        self.collection.add(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+        )
+        self._bump_generation()
+
+        logger.debug(f"Inserted {len(ids)} chunks into VectorDB")
+        return ids
+
+    def _prepare_chunks(
+        self,
+        text: str,
+        metadata: Dict[str, Any],
+        doc_id: Optional[str] = None,
+    ) -> tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """Chunk text and build the (ids, documents, metadatas) columns for collection.add."""
         # Chunk the text with metadata
         chunks_with_metadata = self.chunker.chunk_with_metadata(text, metadata)
 
@@ -204,21 +304,14 @@ class VectorDB:
             documents.append(chunk_text)
             metadatas.append(chunk_metadata)
 
-        # Insert into ChromaDB
-        self.collection.add(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas,
-        )
-
-        logger.debug(f"Inserted {len(ids)} chunks into VectorDB")
-        return ids
+        return ids, documents, metadatas
 
     def search(
         self,
         query_text: str,
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search for similar texts in the vector database.
@@ -227,6 +320,8 @@ class VectorDB:
             query_text: The query text to search for
             n_results: Number of results to return (default: 5)
             where: Optional filter conditions (e.g., {"operation_type": "track"})
+            query_embedding: Precomputed embedding of query_text (see embed_query);
+                skips embedding the text again
 
         Returns:
             List of search results, each containing:
@@ -235,11 +330,18 @@ class VectorDB:
                 - metadata: Associated metadata
                 - distance: Similarity distance (lower is more similar)
         """
-        results = self.collection.query(
-            query_texts=[query_text],
-            n_results=n_results,
-            where=where,
-        )
+        if query_embedding is not None:
+            results = self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                where=where,
+            )
+        else:
+            results = self.collection.query(
+                query_texts=[query_text],
+                n_results=n_results,
+                where=where,
+            )
 
         # Parse results
         parsed_results = []
@@ -289,6 +391,7 @@ class VectorDB:
             commit_hash: The commit hash to delete
         """
         self.collection.delete(where={"commit_hash": commit_hash})
+        self._bump_generation()
         logger.debug(f"Deleted all chunks for commit {commit_hash}")
 
     def update_metadata(self, doc_id: str, new_metadata: Dict[str, Any]) -> None:
@@ -300,6 +403,7 @@ class VectorDB:
             new_metadata: New metadata to set
         """
         self.collection.update(ids=[doc_id], metadatas=[new_metadata])
+        self._bump_generation()
         logger.debug(f"Updated metadata for document {doc_id}")
 
     def get_all(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -394,12 +498,63 @@ class VectorDB:
         )
         return inserted_ids
 
+    def insert_splitted_batch(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert many commits' splitted documents with as few collection.add calls as possible.
+
+        Same document layout as insert_splitted, but chunks are embedded and written in
+        batches of Chroma's max batch size instead of one round-trip per content type
+        per commit.
+
+        Args:
+            entries: List of dicts with keys commit_hash, prompt, response,
+                agent_plan and metadata (same meaning as insert_splitted args)
+
+        Returns:
+            List of inserted document IDs
+        """
+        ids = []
+        documents = []
+        metadatas = []
+
+        for entry in entries:
+            commit_hash = entry["commit_hash"]
+            base_metadata = entry.get("metadata") or {}
+            for content_type in ("prompt", "response", "agent_plan"):
+                text = entry.get(content_type)
+                if not text or not text.strip():
+                    continue
+                chunk_ids, chunk_docs, chunk_metas = self._prepare_chunks(
+                    text,
+                    {**base_metadata, "content_type": content_type},
+                    doc_id=f"{commit_hash}_{content_type}",
+                )
+                ids.extend(chunk_ids)
+                documents.extend(chunk_docs)
+                metadatas.extend(chunk_metas)
+
+        if ids:
+            # Chroma rejects adds above its max batch size; a large sync becomes a few adds
+            batch_size = self.client.get_max_batch_size()
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                self.collection.add(
+                    ids=ids[start:end],
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                )
+            self._bump_generation()
+
+        logger.debug(f"Batch inserted {len(ids)} documents for {len(entries)} commits")
+        return ids
+
     def search_by_content_type(
         self,
         query_text: str,
         content_type: str,
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search by specific content type (prompt, response, or agent_plan).
@@ -409,6 +564,7 @@ class VectorDB:
             content_type: Content type to filter ("prompt", "response", or "agent_plan")
             n_results: Number of results to return (default: 5)
             where: Optional additional filter conditions
+            query_embedding: Precomputed embedding of query_text (see embed_query)
 
         Returns:
             List of search results filtered by content_type
@@ -418,7 +574,47 @@ class VectorDB:
         if where:
             where_clause.update(where)
 
-        return self.search(query_text=query_text, n_results=n_results, where=where_clause)
+        return self.search(
+            query_text=query_text,
+            n_results=n_results,
+            where=where_clause,
+            query_embedding=query_embedding,
+        )
+
+    def search_by_content_types(
+        self,
+        query_text: str,
+        content_types: List[str],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search across several content types with a single query.
+
+        The types are pushed into the query as a `$in` filter, so Chroma ranks every
+        matching document in one pass instead of one search per type.
+
+        Args:
+            query_text: The query text to search for
+            content_types: Content types to include ("prompt", "response", "agent_plan")
+            n_results: Number of results to return (default: 5)
+            where: Optional additional filter conditions
+            query_embedding: Precomputed embedding of query_text (see embed_query)
+
+        Returns:
+            Top n_results across the given content types, closest first
+        """
+        type_filter = {"content_type": {"$in": list(content_types)}}
+        # Chroma needs an explicit $and to combine the type filter with other conditions
+        where_clause = {"$and": [type_filter, where]} if where else type_filter
+
+        return self.search(
+            query_text=query_text,
+            n_results=n_results,
+            where=where_clause,
+            query_embedding=query_embedding,
+        )
 
     def find_similar_prompts(
         self, query_prompt: str, n_results: int = 5, operation_type: Optional[str] = None
@@ -545,6 +741,7 @@ class VectorDB:
         Delete and recreate the collection (removes all data).
         """
         self.client.delete_collection(name=self.collection_name)
+        self._bump_generation()
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
             embedding_function=self.embedding_function,
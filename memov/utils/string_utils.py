@@ -1,13 +1,23 @@
+from functools import lru_cache
+
+_SHORT_MSG_LEN = 15
+
+
+# History output repeats the same prompts and responses across commits
+@lru_cache(maxsize=1024)
 def short_msg(val: str) -> str:
     """Shorten the message to 15 characters, adding '...' if longer."""
     if not isinstance(val, str):
         raise TypeError(f"Expected str, got {type(val)}")
 
-    if not val:
-        return ""
-    return val[:15] + ("..." if len(val) > 15 else "")
+    # Short strings (including "") come back as-is, without slicing or concatenating
+    if len(val) <= _SHORT_MSG_LEN:
+        return val
+    return val[:_SHORT_MSG_LEN] + "..."
 
 
+# The same path shows up in the ls-tree output of many commits
+@lru_cache(maxsize=8192)
 def clean_windows_git_lstree_output(output: str) -> str:
     """Clean up git ls-tree output for Windows compatibility.
 
@@ -22,7 +32,7 @@ def clean_windows_git_lstree_output(output: str) -> str:
 
     # Remove ALL carriage return and newline characters (not just at the end)
     # This handles cases where git output may have embedded control characters
-    result = output.replace('\r', '').replace('\n', '')
+    result = output.replace("\r", "").replace("\n", "")
     # Strip whitespace and remove quotes
     result = result.strip().strip('"')
     return result
@@ -56,6 +66,6 @@ def split_path_parts(rel_path: str) -> list[str]:
     Returns:
         List of path components
     """
-    # Normalize to forward slashes then split
+    # Normalize to forward slashes then split; inlined since this runs per file per commit.
     # This handles both Git output (/) and Windows os.path output (\\)
-    return normalize_path_separator(rel_path).split("/")
+    return rel_path.replace("\\", "/").split("/")
@@ -300,7 +300,7 @@ class UIManager:
             # Get memory usage
             try:
                 process = psutil.Process(pid)
-                memory_mb = process.memory_info().rss / 1024 / 1024
+                memory_mb = process.memory_info().rss >> 20  # bytes -> MiB
             except psutil.NoSuchProcess:
                 memory_mb = 0
 
@@ -313,7 +313,7 @@ class UIManager:
                     "url": f"http://{info['host']}:{info['port']}",
                     "start_time": info.get("start_time", "unknown"),
                     "uptime_seconds": uptime_seconds,
-                    "memory_mb": round(memory_mb, 1),
+                    "memory_mb": memory_mb,
                     "status": "running",
                 }
             )
@@ -329,13 +329,11 @@ class UIManager:
     @staticmethod
     def format_uptime(seconds: int) -> str:
         """Format uptime in human readable format."""
-        if seconds < 60:
-            return f"{seconds}s"
-        elif seconds < 3600:
-            minutes = seconds // 60
-            secs = seconds % 60
+        seconds = int(seconds)
+        minutes, secs = divmod(seconds, 60)
+        if minutes == 0:
+            return f"{secs}s"
+        hours, minutes = divmod(minutes, 60)
+        if hours == 0:
             return f"{minutes}m {secs}s"
-        else:
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            return f"{hours}h {minutes}m"
+        return f"{hours}h {minutes}m"
@@ -1,24 +1,100 @@
 """MemoV Web UI Server - FastAPI backend for visualizing commit history."""
 
+import hashlib
 import logging
 import os
+import re
 import traceback
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Annotated, Optional
 
 import httpx
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from memov.core.git import GitManager
 from memov.core.manager import MemovManager, MemStatus
 
+try:
+    import h2  # noqa: F401
+
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
 LOGGER = logging.getLogger(__name__)
 
-# Global project path (set when server starts)
-_project_path: Optional[str] = None
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered through orjson's C serializer."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=8)
+def _is_initialized(project_path: str, mem_mtime_ns: int) -> bool:
+    """Run the full memov check, cached per (project, .mem mtime) pair."""
+    manager = MemovManager(project_path=project_path)
+    return manager.check() is MemStatus.SUCCESS
+
+
+def _check_initialized(project_path: str) -> bool:
+    """Cheap initialization check: one stat() on the warm path."""
+    try:
+        mem_stat = os.stat(os.path.join(project_path, ".mem"))
+    except FileNotFoundError:
+        return False
+    return _is_initialized(project_path, mem_stat.st_mtime_ns)
+
+
+def _graph_state_key(manager: MemovManager) -> Optional[tuple]:
+    """Fingerprint everything /api/graph reads: the project, all refs, the branch and jump files.
+
+    Snapshots move refs/memov/HEAD and rewrite branches.json, notes move refs/notes/*,
+    and jumps rewrite branches.json/jump.json, so any change yields a new key.
+    """
+    refs = GitManager.list_refs(manager.bare_repo_path)
+    if refs is None:
+        return None
+
+    mtimes = []
+    for name in ("branches.json", "jump.json"):
+        try:
+            mtimes.append(os.stat(os.path.join(manager.mem_root_path, name)).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return manager.project_path, refs, tuple(mtimes)
+
+
+# AI search prompts (static, built once at import time)
+_AI_SEARCH_SYSTEM_PROMPT = """You are an AI assistant helping users search their code history.
+You will be given a list of commits with their prompts/messages.
+Answer the user's question based on this history. Be concise.
+
+IMPORTANT: Your response must be in JSON format with two fields:
+1. "answer": A concise answer to the user's question
+2. "commit_ids": An array of relevant commit hashes (short 7-char format) mentioned in your answer
+
+Example format:
+{
+  "answer": "You fixed the login bug in commit abc1234...",
+  "commit_ids": ["abc1234", "def5678"]
+}"""
+
+_AI_SEARCH_USER_TEMPLATE = """Commit history (format: [hash] branch | prompt):
+
+{history_context}
+
+Question: {query}
+
+Remember to respond in JSON format with "answer" and "commit_ids" fields."""
 
 
 # AI Search request model (defined at module level for proper serialization)
@@ -28,57 +104,154 @@ class AISearchRequest(BaseModel):
     provider: str = "openai"  # "anthropic" or "openai"
 
 
-async def _call_anthropic(api_key: str, system_prompt: str, user_prompt: str) -> str:
-    """Call Anthropic Claude API."""
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            },
-            json={
-                "model": "claude-sonnet-4-20250514",
-                "max_tokens": 1024,
-                "system": system_prompt,
-                "messages": [{"role": "user", "content": user_prompt}],
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["content"][0]["text"]
+def _create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client shared by all outbound AI API calls.
+
+    HTTP/2 (multiplexed requests over one connection) is enabled when the optional
+    `h2` package is installed, e.g. via `pip install httpx[http2]`.
+    """
+    return httpx.AsyncClient(
+        http2=H2_AVAILABLE,
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
 
 
-async def _call_openai(api_key: str, system_prompt: str, user_prompt: str) -> str:
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Own the shared HTTP client for one server run.
+
+    Created here rather than in create_app so the client belongs to the serving event
+    loop, and so each startup (server reload, new TestClient block) gets a live client.
+    """
+    app.state.http_client = _create_http_client()
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
+        app.state.http_client = None
+
+
+# Model used per provider; part of the AI search cache key
+_AI_SEARCH_MODELS = {
+    "anthropic": "claude-sonnet-4-20250514",
+    "openai": "gpt-4o-mini",
+}
+
+
+async def _call_anthropic(
+    client: httpx.AsyncClient, api_key: str, system_prompt: str, user_prompt: str
+) -> str:
+    """Call Anthropic Claude API."""
+    response = await client.post(
+        "https://api.anthropic.com/v1/messages",
+        headers={
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        },
+        json={
+            "model": _AI_SEARCH_MODELS["anthropic"],
+            "max_tokens": 1024,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": user_prompt}],
+        },
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data["content"][0]["text"]
+
+
+async def _call_openai(
+    client: httpx.AsyncClient, api_key: str, system_prompt: str, user_prompt: str
+) -> str:
     """Call OpenAI API."""
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": "gpt-4o-mini",
-                "max_tokens": 1024,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+    response = await client.post(
+        "https://api.openai.com/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+        json={
+            "model": _AI_SEARCH_MODELS["openai"],
+            "max_tokens": 1024,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        },
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data["choices"][0]["message"]["content"]
 
 
-def create_app(project_path: str) -> "FastAPI":
-    """Create FastAPI application with routes."""
-    global _project_path
-    _project_path = project_path
+async def _call_provider(
+    client: httpx.AsyncClient, provider: str, api_key: str, system_prompt: str, user_prompt: str
+) -> str:
+    """Dispatch an AI search prompt to the requested provider."""
+    if provider == "anthropic":
+        return await _call_anthropic(client, api_key, system_prompt, user_prompt)
+    if provider == "openai":
+        return await _call_openai(client, api_key, system_prompt, user_prompt)
+    raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
+
+
+_AI_SEARCH_CACHE_SIZE = 128
+
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+_SHORT_HASH_RE = re.compile(r"\b[a-f0-9]{7}\b")
+
 
-    app = FastAPI(title="MemoV Web UI", version="1.0.0")
+def _parse_ai_search_response(ai_response: str) -> tuple[str, list[str]]:
+    """Extract (answer, short commit ids) from a model reply.
+
+    Accepts plain or markdown-fenced JSON; anything else falls back to the raw
+    text with commit hashes scraped out of it.
+    """
+    try:
+        parsed = orjson.loads(_FENCE_RE.sub("", ai_response))
+    except orjson.JSONDecodeError:
+        parsed = None
+
+    if isinstance(parsed, dict):
+        commit_ids = parsed.get("commit_ids")
+        if not isinstance(commit_ids, list):
+            commit_ids = []
+        return parsed.get("answer", ai_response), [c for c in commit_ids if isinstance(c, str)]
+
+    # Fallback if AI doesn't return JSON: extract commit hashes from the text
+    return ai_response, _SHORT_HASH_RE.findall(ai_response.lower())
+
+
+def get_project_path(request: Request) -> str:
+    """Dependency: the project directory the app was created for."""
+    return request.app.state.project_path
+
+
+ProjectPath = Annotated[str, Depends(get_project_path)]
+
+
+def create_app(project_path: str) -> "FastAPI":
+    """Create FastAPI application with routes.
+
+    Routes resolve the project through the `get_project_path` dependency, so one app
+    can be pointed at another project with `app.dependency_overrides`.
+    """
+    app = FastAPI(
+        title="MemoV Web UI",
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=_lifespan,
+    )
+    # Shared pooled client so AI calls reuse TCP/TLS connections across requests;
+    # set by _lifespan while the app is being served
+    app.state.http_client = None
+    app.state.project_path = project_path
+    # AI search answers keyed by a hash of the model input
+    app.state.ai_search_cache = {}
+    # Last serialized /api/graph body as (state key, bytes); see _graph_state_key
+    app.state.graph_cache = None
 
     # Global exception handler for better error messages
     @app.exception_handler(Exception)
@@ -93,70 +266,66 @@ def create_app(project_path: str) -> "FastAPI":
 
     # API Routes
     @app.get("/api/status")
-    def get_status():
+    def get_status(project_path: ProjectPath):
         """Get memov initialization status."""
-        manager = MemovManager(project_path=_project_path)
-        initialized = manager.check() is MemStatus.SUCCESS
         return {
-            "initialized": initialized,
-            "project_path": _project_path,
+            "initialized": _check_initialized(project_path),
+            "project_path": project_path,
         }
 
     @app.get("/api/branches")
-    def get_branches():
+    def get_branches(project_path: ProjectPath):
         """Get all branches and current branch."""
-        manager = MemovManager(project_path=_project_path)
-        if manager.check() is not MemStatus.SUCCESS:
+        if not _check_initialized(project_path):
             # Return empty data instead of error - let frontend show "not initialized" UI
             return {"current": None, "branches": {}}
 
+        manager = MemovManager(project_path=project_path)
         branches = manager._load_branches()
         if branches is None:
             return {"current": None, "branches": {}}
         return branches
 
     @app.get("/api/graph")
-    def get_graph():
+    def get_graph(project_path: ProjectPath):
         """Get commit graph data for visualization."""
-        manager = MemovManager(project_path=_project_path)
-        if manager.check() is not MemStatus.SUCCESS:
+        if not _check_initialized(project_path):
             # Return empty graph instead of error - let frontend show "not initialized" UI
             return {"nodes": [], "edges": [], "jump_edges": [], "current_branch": None}
 
-        history = manager.get_history(limit=10000, diff_mode="status")
+        manager = MemovManager(project_path=project_path)
+
+        # The graph only changes when refs or the branch/jump files do; reuse the
+        # serialized body otherwise instead of re-walking the whole history
+        state_key = _graph_state_key(manager)
+        cached = app.state.graph_cache
+        if state_key is not None and cached is not None and cached[0] == state_key:
+            return Response(content=cached[1], media_type="application/json")
+
         branches = manager._load_branches()
 
-        # Build graph structure
-        nodes = []
+        # Build graph structure in one pass over the lazily produced history
+        # (iter_history already yields each commit once)
+        nodes = [
+            {
+                "id": entry["commit_hash"],
+                "short_hash": entry["short_hash"],
+                "operation": entry["operation"],
+                "branch": entry["branch"],
+                "is_head": entry["is_head"],
+                "prompt": entry["prompt"],
+                "response": entry["response"],
+                "agent_plan": entry["agent_plan"],
+                "files": entry["files"],
+                "timestamp": entry["timestamp"],
+                "author": entry["author"],
+                "diff": entry.get("diff", {}),
+            }
+            for entry in manager.iter_history(limit=10000, diff_mode="status")
+        ]
         edges = []
-        seen_commits = set()
-
-        for entry in history:
-            commit_hash = entry["commit_hash"]
-            if commit_hash in seen_commits:
-                continue
-            seen_commits.add(commit_hash)
-
-            nodes.append(
-                {
-                    "id": commit_hash,
-                    "short_hash": entry["short_hash"],
-                    "operation": entry["operation"],
-                    "branch": entry["branch"],
-                    "is_head": entry["is_head"],
-                    "prompt": entry["prompt"],
-                    "response": entry["response"],
-                    "agent_plan": entry["agent_plan"],
-                    "files": entry["files"],
-                    "timestamp": entry["timestamp"],
-                    "author": entry["author"],
-                    "diff": entry.get("diff", {}),
-                }
-            )
 
         # Build edges (parent relationships) using git rev-list
-        from memov.core.git import GitManager
-
         if branches:
             for branch_name, tip_hash in branches.get("branches", {}).items():
                 commit_list = GitManager.get_commit_history(manager.bare_repo_path, tip_hash)
@@ -193,126 +362,147 @@ def create_app(project_path: str) -> "FastAPI":
                     }
                 )
 
-        return {
-            "nodes": nodes,
-            "edges": edges,
-            "jump_edges": jump_edges,
-            "current_branch": branches.get("current") if branches else None,
-        }
+        # Payload is plain JSON types already; hand it straight to orjson and skip
+        # FastAPI's jsonable_encoder walk over every node
+        response = ORJSONResponse(
+            {
+                "nodes": nodes,
+                "edges": edges,
+                "jump_edges": jump_edges,
+                "current_branch": branches.get("current") if branches else None,
+            }
+        )
+        if state_key is not None:
+            app.state.graph_cache = (state_key, response.body)
+        return response
 
     @app.get("/api/commit/{commit_hash}")
-    def get_commit(commit_hash: str):
+    def get_commit(commit_hash: str, project_path: ProjectPath):
         """Get detailed info for a specific commit."""
-        manager = MemovManager(project_path=_project_path)
-        if manager.check() is not MemStatus.SUCCESS:
+        if not _check_initialized(project_path):
             raise HTTPException(status_code=400, detail="Memov not initialized")
 
-        history = manager.get_history(limit=100)
-        for entry in history:
-            if entry["commit_hash"].startswith(commit_hash) or entry["short_hash"] == commit_hash:
-                return entry
-
-        raise HTTPException(status_code=404, detail=f"Commit {commit_hash} not found")
+        manager = MemovManager(project_path=project_path)
+        # Diff is served by /api/diff, so skip it here and stop at the first match
+        entry = next(
+            (
+                e
+                for e in manager.iter_history(limit=100, diff_mode="none")
+                if e["commit_hash"].startswith(commit_hash) or e["short_hash"] == commit_hash
+            ),
+            None,
+        )
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Commit {commit_hash} not found")
+        return entry
 
     @app.get("/api/diff/{commit_hash}")
-    def get_diff(commit_hash: str):
+    def get_diff(commit_hash: str, project_path: ProjectPath):
         """Get diff for a commit."""
-        manager = MemovManager(project_path=_project_path)
-        if manager.check() is not MemStatus.SUCCESS:
+        if not _check_initialized(project_path):
             raise HTTPException(status_code=400, detail="Memov not initialized")
 
+        manager = MemovManager(project_path=project_path)
         diff_content = manager.get_diff(commit_hash)
         return {"commit_hash": commit_hash, "diff": diff_content}
 
     @app.post("/api/jump/{commit_hash}")
-    def jump_to_commit(commit_hash: str):
+    def jump_to_commit(commit_hash: str, project_path: ProjectPath):
         """Jump to a specific commit."""
-        manager = MemovManager(project_path=_project_path)
-        if manager.check() is not MemStatus.SUCCESS:
+        if not _check_initialized(project_path):
             raise HTTPException(status_code=400, detail="Memov not initialized")
 
+        manager = MemovManager(project_path=project_path)
         status, new_branch = manager.jump(commit_hash)
+        # Jump rewrites .mem state; drop cached initialization results
+        _is_initialized.cache_clear()
         if status is not MemStatus.SUCCESS:
             raise HTTPException(status_code=400, detail=f"Jump failed: {status}")
 
         return {"status": "success", "new_branch": new_branch}
 
     @app.post("/api/search/ai")
-    async def ai_search(request: AISearchRequest):
+    async def ai_search(request: AISearchRequest, project_path: ProjectPath):
         """Search history using AI model."""
-        manager = MemovManager(project_path=_project_path)
-        if manager.check() is not MemStatus.SUCCESS:
+        if not _check_initialized(project_path):
             raise HTTPException(status_code=400, detail="Memov not initialized")
 
-        # Get history data
-        history = manager.get_history(limit=50)  # Limit to recent 50 commits
+        manager = MemovManager(project_path=project_path)
+        # Get history data (recent 50 commits; only prompts are sent, so skip diffs)
+        history = manager.get_history(limit=50, diff_mode="none")
 
         # Build compact history summary for AI (only prompt/commit message)
-        history_text = []
-        for entry in history:
-            prompt = entry["prompt"] or "N/A"
-            summary = f"[{entry['short_hash']}] {entry['branch']} | {prompt[:200]}"
-            history_text.append(summary)
-
-        history_context = "\n".join(history_text)
+        history_context = "\n".join(
+            f"[{entry['short_hash']}] {entry['branch']} | {(entry['prompt'] or 'N/A')[:200]}"
+            for entry in history
+        )
 
         # Build AI prompt
-        system_prompt = """You are an AI assistant helping users search their code history.
-You will be given a list of commits with their prompts/messages.
-Answer the user's question based on this history. Be concise.
-
-IMPORTANT: Your response must be in JSON format with two fields:
-1. "answer": A concise answer to the user's question
-2. "commit_ids": An array of relevant commit hashes (short 7-char format) mentioned in your answer
-
-Example format:
-{
-  "answer": "You fixed the login bug in commit abc1234...",
-  "commit_ids": ["abc1234", "def5678"]
-}"""
-
-        user_prompt = f"""Commit history (format: [hash] branch | prompt):
-
-{history_context}
-
-Question: {request.query}
+        system_prompt = _AI_SEARCH_SYSTEM_PROMPT
+        user_prompt = _AI_SEARCH_USER_TEMPLATE.format(
+            history_context=history_context, query=request.query
+        )
 
-Remember to respond in JSON format with "answer" and "commit_ids" fields."""
+        # The model input is a pure function of provider, model and prompt; reuse the answer
+        # when neither the question nor the recent history has changed. Answers are only
+        # shared with callers presenting the same API key (hashed, never stored as-is)
+        key_fingerprint = hashlib.blake2b(
+            request.api_key.encode("utf-8"), digest_size=16
+        ).hexdigest()
+        input_hash = hashlib.blake2b(
+            f"{request.provider}\n{_AI_SEARCH_MODELS.get(request.provider)}\n"
+            f"{key_fingerprint}\n{user_prompt}".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        cached = app.state.ai_search_cache.get(input_hash)
+        if cached is not None:
+            return cached
 
         try:
-            if request.provider == "anthropic":
-                ai_response = await _call_anthropic(request.api_key, system_prompt, user_prompt)
-            elif request.provider == "openai":
-                ai_response = await _call_openai(request.api_key, system_prompt, user_prompt)
+            if app.state.http_client is not None:
+                ai_response = await _call_provider(
+                    app.state.http_client,
+                    request.provider,
+                    request.api_key,
+                    system_prompt,
+                    user_prompt,
+                )
             else:
-                raise HTTPException(status_code=400, detail=f"Unknown provider: {request.provider}")
-
-            # Parse JSON response
-            import json
-            try:
-                parsed = json.loads(ai_response)
-                answer = parsed.get("answer", ai_response)
-                commit_ids = parsed.get("commit_ids", [])
-            except json.JSONDecodeError:
-                # Fallback if AI doesn't return JSON
-                answer = ai_response
-                commit_ids = []
-                # Try to extract commit hashes from the response
-                import re
-                commit_ids = re.findall(r'\b[a-f0-9]{7}\b', ai_response.lower())
-
-            # Convert short hashes to full commit hashes
+                # Lifespan not running (e.g. a TestClient used outside a `with` block)
+                async with _create_http_client() as client:
+                    ai_response = await _call_provider(
+                        client, request.provider, request.api_key, system_prompt, user_prompt
+                    )
+
+            answer, commit_ids = _parse_ai_search_response(ai_response)
+
+            # Convert short hashes to full commit hashes (exact 7-char hit via dict,
+            # shorter prefixes fall back to a scan in history order)
+            short_to_full = {}
+            for entry in history:
+                short_to_full.setdefault(entry["short_hash"].lower(), entry["commit_hash"])
             full_commit_ids = []
             for short_hash in commit_ids:
-                for entry in history:
-                    if entry["short_hash"].lower().startswith(short_hash.lower()):
-                        full_commit_ids.append(entry["commit_hash"])
-                        break
-
-            return {
-                "response": answer,
-                "commit_ids": full_commit_ids
-            }
+                short_hash = short_hash.lower()
+                full_hash = short_to_full.get(short_hash)
+                if full_hash is None:
+                    full_hash = next(
+                        (
+                            full
+                            for short, full in short_to_full.items()
+                            if short.startswith(short_hash)
+                        ),
+                        None,
+                    )
+                if full_hash is not None:
+                    full_commit_ids.append(full_hash)
+
+            result = {"response": answer, "commit_ids": full_commit_ids}
+            app.state.ai_search_cache[input_hash] = result
+            if len(app.state.ai_search_cache) > _AI_SEARCH_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del app.state.ai_search_cache[next(iter(app.state.ai_search_cache))]
+            return result
         except httpx.HTTPStatusError as e:
             raise HTTPException(
                 status_code=e.response.status_code, detail=f"API error: {e.response.text}"
@@ -324,15 +514,22 @@ Remember to respond in JSON format with "answer" and "commit_ids" fields."""
     # Serve static files
     static_dir = Path(__file__).parent / "static"
     if static_dir.exists():
+        # Read index.html once; serving is then a memcpy plus ETag revalidation
+        index_path = static_dir / "index.html"
+        index_bytes = index_path.read_bytes() if index_path.exists() else None
+        index_etag = f'"{hashlib.md5(index_bytes).hexdigest()}"' if index_bytes else None
 
         @app.get("/")
-        def serve_index():
+        def serve_index(request: Request):
             """Serve the main HTML page."""
-            index_path = static_dir / "index.html"
-            if index_path.exists():
-                # Use explicit utf-8 encoding for Windows compatibility
-                return HTMLResponse(content=index_path.read_text(encoding="utf-8"), status_code=200)
-            raise HTTPException(status_code=404, detail="index.html not found")
+            if index_bytes is None:
+                raise HTTPException(status_code=404, detail="index.html not found")
+            headers = {"ETag": index_etag, "Cache-Control": "public, max-age=60"}
+            if request.headers.get("if-none-match") == index_etag:
+                return Response(status_code=304, headers=headers)
+            return Response(
+                content=index_bytes, media_type="text/html; charset=utf-8", headers=headers
+            )
 
         # Mount static files for assets (logo, etc.)
         app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
@@ -1,4 +1,9 @@
-"""Shared test fixtures for MemoV tests."""
+"""Shared test fixtures for MemoV tests.
+
+When the suite runs under pytest-xdist (``-n auto --dist loadfile``), session-scoped fixtures
+are built once per worker rather than once per run. Tests only ever receive clones of those
+templates, so sharing them between the files of one worker is safe.
+"""
 
 import os
 import shutil
@@ -8,25 +13,133 @@ from pathlib import Path
 
 import pytest
 
+from memov.core.manager import MemovManager
+
+# Appended to .git/config instead of running `git config` twice per repo
+GIT_TEST_USER_CONFIG = "[user]\n\temail = test@test.com\n\tname = Test User\n"
+
+# Two snapshots: original file, then a refactor of test.py
+SAMPLE_SNAPSHOTS = (
+    {
+        "prompt": "Add hello function",
+        "response": "I added a hello function",
+        "agent_plan": "1. Create hello function\n2. Test it",
+    },
+    {
+        "files": {"test.py": "def hello():\n    print('hello')\n"},
+        "prompt": "Refactor to function",
+        "response": "Refactored print to a function",
+        "agent_plan": "1. Wrap in function\n2. Add docstring",
+    },
+)
+
+
+def pytest_addoption(parser):
+    """Register the opt-in flag for slow tests."""
+    parser.addoption(
+        "--run-slow",
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="run tests marked slow (1000-commit benchmarks, snapshot format checks)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked slow unless --run-slow is given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def _git_template(tmp_path_factory):
+    """Build a git-initialized project skeleton once per test session."""
+    template_path = tmp_path_factory.mktemp("template") / "test_project"
+    template_path.mkdir()
+
+    # Initialize git repo in-process via libgit2 when available, else with a single git process;
+    # identity goes straight into .git/config either way
+    try:
+        import pygit2
+    except ImportError:
+        subprocess.run(["git", "init"], cwd=template_path, capture_output=True)
+    else:
+        pygit2.init_repository(str(template_path), bare=False)
+    with open(template_path / ".git" / "config", "a") as f:
+        f.write(GIT_TEST_USER_CONFIG)
+
+    # Create a sample file
+    (template_path / "test.py").write_text("print('hello')\n")
+
+    return template_path
+
+
+@pytest.fixture(scope="session")
+def _bench_project_factory(tmp_path_factory, _git_template):
+    """Return a callable that builds a memov-initialized project under the session temp dir.
+
+    For session- and module-scoped fixtures whose tests only read history and so
+    can share one repository, e.g. the benchmark repos.
+    """
+
+    def _create(name):
+        project_path = tmp_path_factory.mktemp(name) / "test_project"
+        shutil.copytree(_git_template, project_path)
+
+        manager = MemovManager(project_path=str(project_path))
+        manager.init()
+        return manager, project_path
+
+    return _create
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink git object files, which are never modified in place; copy everything else."""
+    if f"{os.sep}objects{os.sep}" in src:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _clone_tree(src: Path, dst: Path) -> None:
+    """Copy a prepared project tree to dst, sharing the immutable git object files.
+
+    Working files and refs/branch JSON are real copies, so tests may rewrite them freely.
+    """
+    shutil.copytree(src, dst, copy_function=_link_or_copy, dirs_exist_ok=True)
+
+
+@pytest.fixture(scope="session")
+def _initialized_template(_bench_project_factory):
+    """Project with `mem init` already run, built once per session."""
+    _, project_path = _bench_project_factory("initialized_template")
+    return project_path
+
+
+@pytest.fixture(scope="session")
+def _snapshots_template(_initialized_template, tmp_path_factory):
+    """Initialized project plus SAMPLE_SNAPSHOTS, built once per session."""
+    project_path = tmp_path_factory.mktemp("snapshots_template") / "test_project"
+    _clone_tree(_initialized_template, project_path)
+    MemovManager(project_path=str(project_path)).snapshot_many(SAMPLE_SNAPSHOTS)
+    return project_path
+
 
 @pytest.fixture
-def temp_project():
+def temp_project(_git_template):
     """Create a temporary project directory with git initialized."""
     temp_dir = tempfile.mkdtemp()
     project_path = Path(temp_dir) / "test_project"
-    project_path.mkdir()
 
-    # Initialize git repo
-    subprocess.run(["git", "init"], cwd=project_path, capture_output=True)
-    subprocess.run(
-        ["git", "config", "user.email", "test@test.com"], cwd=project_path, capture_output=True
-    )
-    subprocess.run(
-        ["git", "config", "user.name", "Test User"], cwd=project_path, capture_output=True
-    )
-
-    # Create a sample file
-    (project_path / "test.py").write_text("print('hello')\n")
+    # Clone the session template
+    _clone_tree(_git_template, project_path)
 
     yield project_path
 
@@ -35,36 +148,35 @@ def temp_project():
 
 
 @pytest.fixture
-def initialized_memov(temp_project):
-    """Create a temporary project with memov initialized."""
-    from memov.core.manager import MemovManager
+def initialized_memov(temp_project, _initialized_template):
+    """Create a temporary project with memov initialized.
 
-    manager = MemovManager(project_path=str(temp_project))
-    manager.init()
-
-    return manager
+    The project is a per-test clone of a session template, so `mem init` runs once.
+    """
+    _clone_tree(_initialized_template, temp_project)
+    return MemovManager(project_path=str(temp_project))
 
 
 @pytest.fixture
-def memov_with_snapshots(initialized_memov, temp_project):
-    """Create a memov instance with some test snapshots."""
-    manager = initialized_memov
-
-    # Create first snapshot
-    manager.snapshot(
-        prompt="Add hello function",
-        response="I added a hello function",
-        agent_plan="1. Create hello function\n2. Test it",
-        by_user=False,
-    )
+def memov_with_snapshots(temp_project, _snapshots_template):
+    """Create a memov instance with some test snapshots (a clone of a session template)."""
+    _clone_tree(_snapshots_template, temp_project)
+    return MemovManager(project_path=str(temp_project))
 
-    # Modify file and create another snapshot
-    (temp_project / "test.py").write_text("def hello():\n    print('hello')\n")
-    manager.snapshot(
-        prompt="Refactor to function",
-        response="Refactored print to a function",
-        agent_plan="1. Wrap in function\n2. Add docstring",
-        by_user=False,
-    )
 
+@pytest.fixture(scope="module")
+def initialized_memov_module(_bench_project_factory):
+    """Module-scoped initialized memov for tests that never modify the project."""
+    manager, _ = _bench_project_factory("memov_module")
+    return manager
+
+
+@pytest.fixture(scope="module")
+def memov_with_snapshots_module(_bench_project_factory):
+    """Module-scoped counterpart of memov_with_snapshots for read-only tests.
+
+    Built in its own project, so initialized_memov_module stays snapshot-free.
+    """
+    manager, _ = _bench_project_factory("memov_snapshots_module")
+    manager.snapshot_many(SAMPLE_SNAPSHOTS)
     return manager
@@ -2,8 +2,42 @@
 
 import pytest
 
+from memov.core.git import GitManager
 from memov.core.manager import MemovManager, MemStatus
 
+# Fields every get_history() entry must carry
+_HISTORY_FIELDS = frozenset(
+    (
+        "commit_hash",
+        "short_hash",
+        "operation",
+        "branch",
+        "is_head",
+        "prompt",
+        "response",
+        "agent_plan",
+        "files",
+        "timestamp",
+        "author",
+    )
+)
+
+
+@pytest.fixture(scope="module")
+def format_snapshot(_bench_project_factory):
+    """Raw commit message of one snapshot, shared by the read-only format tests."""
+    manager, _ = _bench_project_factory("agent_plan_format")
+    manager.snapshot(
+        prompt="User prompt here",
+        response="AI response here",
+        agent_plan="Do step A, then step B",
+        by_user=False,
+    )
+
+    branches = manager._load_branches()
+    tip = branches["branches"][branches["current"]]
+    return GitManager.get_commit_message(manager.bare_repo_path, tip)
+
 
 class TestAgentPlanStorage:
     """Tests for storing agent_plan in commit messages."""
@@ -40,9 +74,6 @@ class TestAgentPlanStorage:
         )
         assert status == MemStatus.SUCCESS
 
-        history = manager.get_history(limit=1)
-        assert len(history) >= 1
-
     def test_snapshot_with_files_stores_agent_plan(self, initialized_memov, temp_project):
         """Test that snapshot with specific files also stores agent_plan."""
         manager = initialized_memov
@@ -68,91 +99,42 @@ class TestAgentPlanStorage:
 class TestAgentPlanParsing:
     """Tests for parsing agent_plan from commit messages."""
 
-    def test_get_history_includes_agent_plan(self, memov_with_snapshots):
+    def test_get_history_includes_agent_plan(self, memov_with_snapshots_module):
         """Test that get_history() returns agent_plan field."""
-        manager = memov_with_snapshots
+        manager = memov_with_snapshots_module
 
         history = manager.get_history(limit=10)
         assert len(history) >= 2
 
-        for entry in history:
-            assert "agent_plan" in entry
-            # agent_plan may be empty string but should exist
+        # agent_plan may be empty string but should exist
+        missing = [i for i, entry in enumerate(history) if "agent_plan" not in entry]
+        assert not missing, f"entries missing agent_plan: {missing}"
 
-    def test_agent_plan_in_history_entry_structure(self, memov_with_snapshots):
+    def test_agent_plan_in_history_entry_structure(self, memov_with_snapshots_module):
         """Test the structure of history entries with agent_plan."""
-        manager = memov_with_snapshots
+        manager = memov_with_snapshots_module
 
         history = manager.get_history(limit=1)
         entry = history[0]
 
         # Verify all expected fields are present
-        expected_fields = [
-            "commit_hash",
-            "short_hash",
-            "operation",
-            "branch",
-            "is_head",
-            "prompt",
-            "response",
-            "agent_plan",
-            "files",
-            "timestamp",
-            "author",
-        ]
-
-        for field in expected_fields:
-            assert field in entry, f"Missing field: {field}"
+        missing = _HISTORY_FIELDS - entry.keys()
+        assert not missing, f"Missing fields: {sorted(missing)}"
 
 
 class TestAgentPlanCommitMessageFormat:
     """Tests for the commit message format with agent_plan."""
 
-    def test_commit_message_contains_agent_plan_line(self, initialized_memov, temp_project):
+    def test_commit_message_contains_agent_plan_line(self, format_snapshot):
         """Test that the raw commit message contains 'Agent Plan:' line."""
-        from memov.core.git import GitManager
-
-        manager = initialized_memov
-
-        manager.snapshot(
-            prompt="Test",
-            response="Test response",
-            agent_plan="Do step A, then step B",
-            by_user=False,
-        )
-
-        # Get the latest commit hash
-        history = manager.get_history(limit=1)
-        if not history:
-            pytest.skip("No commits found")
-
-        commit_hash = history[0]["commit_hash"]
-
-        # Get raw commit message
-        message = GitManager.get_commit_message(manager.bare_repo_path, commit_hash)
+        message = format_snapshot
 
         assert "Agent Plan:" in message
         assert "Do step A, then step B" in message
 
-    def test_commit_message_format_order(self, initialized_memov, temp_project):
+    def test_commit_message_format_order(self, format_snapshot):
         """Test that commit message fields are in expected order."""
-        from memov.core.git import GitManager
-
-        manager = initialized_memov
-
-        manager.snapshot(
-            prompt="User prompt here",
-            response="AI response here",
-            agent_plan="Plan step 1",
-            by_user=False,
-        )
-
-        history = manager.get_history(limit=1)
-        if not history:
-            pytest.skip("No commits found")
-
-        commit_hash = history[0]["commit_hash"]
-        message = GitManager.get_commit_message(manager.bare_repo_path, commit_hash)
+        message = format_snapshot
 
         # Verify order: Prompt -> Response -> Agent Plan -> Source
         prompt_pos = message.find("Prompt:")
@@ -192,9 +174,6 @@ class TestAgentPlanEdgeCases:
         )
         assert status == MemStatus.SUCCESS
 
-        history = manager.get_history(limit=1)
-        assert len(history) >= 1
-
     def test_agent_plan_none_value(self, initialized_memov, temp_project):
         """Test that None agent_plan is handled gracefully."""
         manager = initialized_memov
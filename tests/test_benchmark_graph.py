@@ -4,188 +4,261 @@ These tests measure and compare performance of the get_history method
 which is used by the /api/graph endpoint.
 
 Run with: pytest tests/test_benchmark_graph.py -v -s
+
+The 1000-commit classes (Test1kBenchmark, TestLargeScaleBenchmark) are marked slow and
+skipped by default; add ``--run-slow`` (alias ``--runslow``) to include them.
+
+Timings use the pytest-benchmark ``benchmark`` fixture; pass e.g.
+``--benchmark-autosave`` / ``--benchmark-compare-fail=mean:10%`` to track regressions.
+Under pytest-xdist (``-n auto``) pytest-benchmark disables timing, so these tests skip
+their time limits; run serially to check them.
 """
 
+import os
+import shutil
+import subprocess
 import time
 from pathlib import Path
 
 import pytest
+from fastapi.testclient import TestClient
+
+from memov.core.git import GitManager
+from memov.core.manager import MemovManager
+from memov.web.server import create_app
+
+# Fields every get_history(diff_mode="status") entry must carry
+_HISTORY_FIELDS = frozenset(
+    (
+        "commit_hash",
+        "short_hash",
+        "operation",
+        "branch",
+        "is_head",
+        "prompt",
+        "response",
+        "agent_plan",
+        "files",
+        "timestamp",
+        "author",
+        "diff",
+    )
+)
 
 
-@pytest.fixture
-def memov_with_many_snapshots(initialized_memov, temp_project):
-    """Create a memov instance with many test snapshots for benchmarking."""
-    manager = initialized_memov
-    num_snapshots = 50  # Create 50 snapshots for benchmark
+@pytest.fixture(scope="session")
+def memov_with_many_snapshots(_bench_project_factory):
+    """Create a memov instance with many test snapshots for benchmarking.
 
-    for i in range(num_snapshots):
-        # Create/modify files
-        (temp_project / f"file_{i}.py").write_text(f"# File {i}\nprint('hello {i}')\n")
+    Session scoped: the benchmarks only read history, so the repo is built once.
+    """
+    manager, project_path = _bench_project_factory("bench_50")
+    num_snapshots = 50  # Create 50 snapshots for benchmark
 
-        manager.snapshot(
-            prompt=f"Add file {i} with hello function",
-            response=f"I added file {i} with a hello function that prints hello {i}",
-            agent_plan=f"1. Create file_{i}.py\n2. Add print statement",
-            by_user=False,
-        )
+    # The files stay untracked, so snapshot() never reads them; write them all up
+    # front with raw fds instead of one Path.write_text per loop iteration
+    contents = {
+        f"file_{i}.py": f"# File {i}\nprint('hello {i}')\n".encode() for i in range(num_snapshots)
+    }
+    for name, content in contents.items():
+        fd = os.open(project_path / name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+
+    manager.snapshot_many(
+        [
+            {
+                "prompt": f"Add file {i} with hello function",
+                "response": f"I added file {i} with a hello function that prints hello {i}",
+                "agent_plan": f"1. Create file_{i}.py\n2. Add print statement",
+            }
+            for i in range(num_snapshots)
+        ]
+    )
 
-    return manager
+    return manager, project_path
 
 
-@pytest.fixture
-def memov_with_large_history(initialized_memov, temp_project):
-    """Create a memov instance with large number of snapshots for stress testing.
+def _fast_import_history(manager, num_commits, file_pool=50):
+    """Append ``num_commits`` snapshot commits to the memov repo with one git fast-import.
 
-    Note: Creating 200+ real commits takes time. Adjust num_snapshots as needed.
+    Each commit carries the same message layout as ``MemovManager.snapshot`` and
+    rewrites one of ``file_pool`` files, so history, notes parsing and diff status
+    all see realistic data without forking git several times per commit.
     """
-    manager = initialized_memov
-    num_snapshots = 200  # Increase for larger tests
-
-    for i in range(num_snapshots):
-        # Create/modify files - use modulo to reuse files and reduce disk usage
-        file_idx = i % 20
-        (temp_project / f"file_{file_idx}.py").write_text(
-            f"# File {file_idx} - version {i}\nprint('hello {i}')\n"
-        )
+    head = GitManager.get_commit_id_by_ref(manager.bare_repo_path, "refs/memov/HEAD")
+
+    chunks = []
+    for i in range(num_commits):
+        file_idx = i % file_pool
+        content = f"# File {file_idx} - version {i}\nprint('hello {i}')\n".encode()
+        message = (
+            "Create snapshot\n\n"
+            f"Prompt: Update {i}: modify file_{file_idx}\n"
+            f"Response: Modified file_{file_idx} in iteration {i}\n"
+            f"Agent Plan: 1. Update file_{file_idx}.py\n2. Version {i}\n"
+            "Source: AI"
+        ).encode()
+
+        chunks.append(b"commit refs/memov/HEAD\n")
+        chunks.append(b"committer Test User <test@test.com> now\n")
+        chunks.append(b"data %d\n%s\n" % (len(message), message))
+        if i == 0:
+            chunks.append(b"from %s\n" % head.encode())
+        chunks.append(b"M 100644 inline file_%d.py\n" % file_idx)
+        chunks.append(b"data %d\n%s\n" % (len(content), content))
 
-        manager.snapshot(
-            prompt=f"Update {i}: modify file_{file_idx}",
-            response=f"Modified file_{file_idx} in iteration {i}",
-            agent_plan=f"1. Update file_{file_idx}.py\n2. Version {i}",
-            by_user=False,
-        )
+    subprocess.run(
+        ["git", "fast-import", "--quiet", "--date-format=now"],
+        cwd=manager.bare_repo_path,
+        input=b"".join(chunks),
+        check=True,
+    )
 
-    return manager
+    # Point the memov branch at the imported tip, as _update_branch would
+    tip = GitManager.get_commit_id_by_ref(manager.bare_repo_path, "refs/memov/HEAD")
+    branches = manager._load_branches()
+    branches["branches"][branches["current"]] = tip
+    manager._save_branches(branches)
 
 
-@pytest.fixture(scope="module")
-def memov_with_1k_history(tmp_path_factory):
+@pytest.fixture(scope="session")
+def memov_with_1k_history(_bench_project_factory, tmp_path_factory):
     """Create a memov instance with 1000 snapshots for stress testing.
 
-    Uses module scope to avoid recreating for each test.
-    Takes about 4-5 minutes to create.
+    Uses session scope to avoid recreating for each test. The commits are
+    streamed through a single ``git fast-import`` so setup takes seconds.
+
+    Under pytest-xdist the first worker builds the repo into the run-wide temp root
+    while holding a file lock; the other workers copy that build instead of
+    importing their own.
     """
-    import subprocess
+    num_snapshots = 1000
 
-    from memov.core.manager import MemovManager
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        manager, project_path = _bench_project_factory("benchmark_1k")
+        print(f"\nImporting {num_snapshots} snapshots...")
+        _fast_import_history(manager, num_snapshots)
+        return manager, project_path
 
-    # Create temp directory that persists for the module
-    temp_dir = tmp_path_factory.mktemp("benchmark_1k")
-    project_path = temp_dir / "test_project"
-    project_path.mkdir()
+    from filelock import FileLock
 
-    # Initialize git repo
-    subprocess.run(["git", "init"], cwd=project_path, capture_output=True)
-    subprocess.run(
-        ["git", "config", "user.email", "test@test.com"],
-        cwd=project_path,
-        capture_output=True,
-    )
-    subprocess.run(
-        ["git", "config", "user.name", "Test User"],
-        cwd=project_path,
-        capture_output=True,
-    )
+    # Shared by every worker of this run; bump the suffix when the history layout changes
+    shared_path = tmp_path_factory.getbasetemp().parent / "bench_1k_v1"
+    with FileLock(f"{shared_path}.lock"):
+        if not shared_path.exists():
+            manager, build_path = _bench_project_factory("benchmark_1k_build")
+            print(f"\nImporting {num_snapshots} snapshots...")
+            _fast_import_history(manager, num_snapshots)
+            shutil.copytree(build_path, shared_path)
 
-    # Create initial file
-    (project_path / "test.py").write_text("print('hello')\n")
+    # fast-import writes a single pack, so the copy is only a handful of files
+    project_path = tmp_path_factory.mktemp("benchmark_1k") / "test_project"
+    shutil.copytree(shared_path, project_path)
+    return MemovManager(project_path=str(project_path)), project_path
 
-    # Initialize memov
-    manager = MemovManager(project_path=str(project_path))
-    manager.init()
 
-    num_snapshots = 1000
-    print(f"\nCreating {num_snapshots} snapshots...")
+@pytest.fixture(scope="session")
+def enumerate_commits():
+    """Return a callable listing every commit reachable from a manager's branches.
 
-    for i in range(num_snapshots):
-        # Progress indicator every 100 commits
-        if i % 100 == 0:
-            print(f"  Progress: {i}/{num_snapshots} ({i * 100 // num_snapshots}%)")
+    The deduplicated list is cached per manager, so the branch walk runs once per
+    benchmark repo rather than once per test.
+    """
+    cache = {}
+
+    def _enumerate(manager):
+        key = id(manager)
+        if key not in cache:
+            # One rev-list over every branch tip; git dedupes shared ancestors itself.
+            # (--all would also pull in the refs/notes commit chain.)
+            tips = list(manager._load_branches()["branches"].values())
+            result = subprocess.run(
+                ["git", f"--git-dir={manager.bare_repo_path}", "rev-list", "--reverse", *tips],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            cache[key] = result.stdout.split()
+        return cache[key]
+
+    return _enumerate
+
+
+def _check_mean(benchmark, limit, label, items=None, unit="commits"):
+    """Print throughput and assert the mean round time stays under ``limit`` seconds.
+
+    pytest-benchmark turns timing off under xdist (or --benchmark-disable) and leaves
+    ``benchmark.stats`` unset; the test is then skipped rather than reported as a pass.
+    """
+    if benchmark.stats is None:
+        pytest.skip(f"{label}: benchmark timing disabled (e.g. under xdist), limit not checked")
+    mean = benchmark.stats["mean"]
+    if items is not None:
+        print(f"Throughput: {items / mean:.1f} {unit}/sec")
+    assert mean < limit, f"{label} took too long: {mean:.3f}s"
 
-        # Create/modify files - use modulo to reuse files and reduce disk usage
-        file_idx = i % 50
-        (project_path / f"file_{file_idx}.py").write_text(
-            f"# File {file_idx} - version {i}\nprint('hello {i}')\n"
-        )
 
-        manager.snapshot(
-            prompt=f"Update {i}: modify file_{file_idx}",
-            response=f"Modified file_{file_idx} in iteration {i}",
-            agent_plan=f"1. Update file_{file_idx}.py\n2. Version {i}",
-            by_user=False,
-        )
+def _graph_client(manager, project_path):
+    """Yield a TestClient for the project, running the app lifespan once."""
+    with TestClient(create_app(str(project_path))) as client:
+        yield client, manager
 
-    print(f"  Completed: {num_snapshots} snapshots created")
-    return manager, project_path
 
+@pytest.fixture(scope="module")
+def graph_client(memov_with_many_snapshots):
+    """Module-scoped web client over the 50-snapshot benchmark repo."""
+    yield from _graph_client(*memov_with_many_snapshots)
 
-class TestGetHistoryBenchmark:
-    """Benchmark tests for get_history method."""
 
-    def test_get_history_performance_status_mode(self, memov_with_many_snapshots):
-        """Benchmark get_history with diff_mode='status' (used by /api/graph)."""
-        manager = memov_with_many_snapshots
+@pytest.fixture(scope="module")
+def graph_response(graph_client):
+    """First /api/graph payload; fetching it also primes the server-side graph cache."""
+    client, _ = graph_client
+    response = client.get("/api/graph")
+    assert response.status_code == 200
+    return response.json()
 
-        # Warm up
-        manager.get_history(limit=10, diff_mode="status")
 
-        # Benchmark
-        iterations = 3
-        times = []
+@pytest.fixture(scope="module")
+def graph_client_1k(memov_with_1k_history):
+    """Module-scoped web client over the 1000-snapshot benchmark repo."""
+    yield from _graph_client(*memov_with_1k_history)
 
-        for _ in range(iterations):
-            start = time.perf_counter()
-            history = manager.get_history(limit=100, diff_mode="status")
-            elapsed = time.perf_counter() - start
-            times.append(elapsed)
 
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
+class TestGetHistoryBenchmark:
+    """Benchmark tests for get_history method."""
+
+    def test_get_history_performance_status_mode(self, memov_with_many_snapshots, benchmark):
+        """Benchmark get_history with diff_mode='status' (used by /api/graph)."""
+        manager, _ = memov_with_many_snapshots
+
+        history = benchmark(manager.get_history, limit=100, diff_mode="status")
 
         print(f"\n--- get_history(limit=100, diff_mode='status') ---")
         print(f"Commits returned: {len(history)}")
-        print(f"Average time: {avg_time:.3f}s")
-        print(f"Min time: {min_time:.3f}s")
-        print(f"Max time: {max_time:.3f}s")
 
         # Performance assertion: should complete in reasonable time
         # With batch optimization, 50 commits should take < 2 seconds
-        assert avg_time < 5.0, f"get_history took too long: {avg_time:.3f}s"
+        _check_mean(benchmark, 5.0, "get_history")
 
-    def test_get_history_performance_none_mode(self, memov_with_many_snapshots):
+    def test_get_history_performance_none_mode(self, memov_with_many_snapshots, benchmark):
         """Benchmark get_history with diff_mode='none' (fastest mode)."""
-        manager = memov_with_many_snapshots
-
-        # Warm up
-        manager.get_history(limit=10, diff_mode="none")
+        manager, _ = memov_with_many_snapshots
 
-        # Benchmark
-        iterations = 3
-        times = []
-
-        for _ in range(iterations):
-            start = time.perf_counter()
-            history = manager.get_history(limit=100, diff_mode="none")
-            elapsed = time.perf_counter() - start
-            times.append(elapsed)
-
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
+        history = benchmark(manager.get_history, limit=100, diff_mode="none")
 
         print(f"\n--- get_history(limit=100, diff_mode='none') ---")
         print(f"Commits returned: {len(history)}")
-        print(f"Average time: {avg_time:.3f}s")
-        print(f"Min time: {min_time:.3f}s")
-        print(f"Max time: {max_time:.3f}s")
 
         # Performance assertion: none mode should be fastest
-        assert avg_time < 3.0, f"get_history (none mode) took too long: {avg_time:.3f}s"
+        _check_mean(benchmark, 3.0, "get_history (none mode)")
 
     def test_get_history_correctness(self, memov_with_many_snapshots):
         """Verify get_history returns correct data structure."""
-        manager = memov_with_many_snapshots
+        manager, _ = memov_with_many_snapshots
 
         history = manager.get_history(limit=10, diff_mode="status")
 
@@ -193,18 +266,8 @@ class TestGetHistoryBenchmark:
 
         # Check first entry has all required fields
         entry = history[0]
-        assert "commit_hash" in entry
-        assert "short_hash" in entry
-        assert "operation" in entry
-        assert "branch" in entry
-        assert "is_head" in entry
-        assert "prompt" in entry
-        assert "response" in entry
-        assert "agent_plan" in entry
-        assert "files" in entry
-        assert "timestamp" in entry
-        assert "author" in entry
-        assert "diff" in entry
+        missing = _HISTORY_FIELDS - entry.keys()
+        assert not missing, f"Missing fields: {sorted(missing)}"
 
         # Verify commit hash format
         assert len(entry["commit_hash"]) == 40
@@ -218,134 +281,98 @@ class TestGetHistoryBenchmark:
         print(f"  has author: {entry['author'] is not None}")
 
 
-class TestGraphApiBenchmark:
-    """Benchmark tests for the /api/graph endpoint."""
+class TestFastImportFormat:
+    """Guard the fast-import fixture against drifting from real snapshot commits."""
 
-    def test_graph_api_performance(self, memov_with_many_snapshots, temp_project):
-        """Benchmark the /api/graph endpoint."""
-        from fastapi.testclient import TestClient
+    @pytest.mark.slow
+    def test_imported_commits_match_snapshot_format(self, _bench_project_factory):
+        """Real snapshots and imported commits parse to the same history fields."""
+        manager, project_path = _bench_project_factory("bench_format")
 
-        from memov.web.server import create_app
+        for i in range(3):
+            (project_path / "test.py").write_text(f"print('hello {i}')\n")
+            manager.snapshot(
+                prompt=f"Update {i}: modify file_0",
+                response=f"Modified file_0 in iteration {i}",
+                agent_plan=f"1. Update file_0.py\n2. Version {i}",
+                by_user=False,
+            )
+        real = manager.get_history(limit=1, diff_mode="none")[0]
 
-        app = create_app(str(temp_project))
-        client = TestClient(app)
+        _fast_import_history(manager, 1)
+        imported = manager.get_history(limit=1, diff_mode="status")[0]
 
-        # Warm up
-        client.get("/api/graph")
+        assert imported["operation"] == real["operation"] == "snap"
+        assert imported["is_head"]
+        assert imported["prompt"] == "Update 0: modify file_0"
+        assert imported["response"] == "Modified file_0 in iteration 0"
+        assert imported["agent_plan"] == real["agent_plan"].replace("Version 2", "Version 0")
+        assert "file_0.py" in imported["files"]
 
-        # Benchmark
-        iterations = 3
-        times = []
 
-        for _ in range(iterations):
-            start = time.perf_counter()
-            response = client.get("/api/graph")
-            elapsed = time.perf_counter() - start
-            times.append(elapsed)
-            assert response.status_code == 200
+class TestGraphApiBenchmark:
+    """Benchmark tests for the /api/graph endpoint."""
 
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
+    def test_graph_api_performance(self, graph_client, graph_response, benchmark):
+        """Benchmark the /api/graph endpoint (served from the graph cache once primed)."""
+        client, _ = graph_client
+
+        response = benchmark(client.get, "/api/graph")
+        assert response.status_code == 200
 
         data = response.json()
+        assert data == graph_response, "Cached graph should match the first response"
 
         print(f"\n--- /api/graph endpoint ---")
         print(f"Nodes returned: {len(data['nodes'])}")
         print(f"Edges returned: {len(data['edges'])}")
-        print(f"Average time: {avg_time:.3f}s")
-        print(f"Min time: {min_time:.3f}s")
-        print(f"Max time: {max_time:.3f}s")
 
         # Performance assertion: graph API should complete quickly
-        assert avg_time < 5.0, f"/api/graph took too long: {avg_time:.3f}s"
+        _check_mean(benchmark, 5.0, "/api/graph")
 
 
+@pytest.mark.slow
 class Test1kBenchmark:
     """Large scale benchmark tests (1000 commits).
 
-    Takes about 4-5 minutes to set up.
-    Run with: pytest tests/test_benchmark_graph.py::Test1kBenchmark -v -s
+    Run with: pytest tests/test_benchmark_graph.py::Test1kBenchmark --run-slow -v -s
     """
 
-    def test_1k_history_performance(self, memov_with_1k_history):
+    def test_1k_history_performance(self, memov_with_1k_history, benchmark):
         """Benchmark get_history with 1000 commits."""
         manager, _ = memov_with_1k_history
 
-        # Benchmark status mode (used by /api/graph)
-        iterations = 3
-        times = []
-
-        for i in range(iterations):
-            start = time.perf_counter()
-            history = manager.get_history(limit=1000, diff_mode="status")
-            elapsed = time.perf_counter() - start
-            times.append(elapsed)
-            print(f"  Iteration {i + 1}: {elapsed:.3f}s, {len(history)} commits")
-
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
+        # Benchmark status mode (used by /api/graph); one call already runs for seconds,
+        # which is plenty against a 30s bound, so take a single round
+        history = benchmark.pedantic(
+            manager.get_history, kwargs={"limit": 1000, "diff_mode": "status"}, rounds=1
+        )
 
         print(f"\n=== 1K BENCHMARK: get_history(limit=1000, diff_mode='status') ===")
         print(f"Commits returned: {len(history)}")
-        print(f"Average time: {avg_time:.3f}s")
-        print(f"Min time: {min_time:.3f}s")
-        print(f"Max time: {max_time:.3f}s")
-        print(f"Throughput: {len(history) / avg_time:.1f} commits/sec")
 
         # Should handle 1000 commits in reasonable time with batch optimization
-        assert avg_time < 30.0, f"1k history took too long: {avg_time:.3f}s"
+        _check_mean(benchmark, 30.0, "1k history", items=len(history))
 
-    def test_1k_graph_api_performance(self, memov_with_1k_history):
+    def test_1k_graph_api_performance(self, graph_client_1k, benchmark):
         """Benchmark /api/graph with 1000 commits."""
-        from fastapi.testclient import TestClient
-
-        from memov.web.server import create_app
-
-        manager, project_path = memov_with_1k_history
-        app = create_app(str(project_path))
-        client = TestClient(app)
-
-        # Benchmark
-        iterations = 3
-        times = []
-
-        for i in range(iterations):
-            start = time.perf_counter()
-            response = client.get("/api/graph")
-            elapsed = time.perf_counter() - start
-            times.append(elapsed)
-            assert response.status_code == 200
-            print(f"  Iteration {i + 1}: {elapsed:.3f}s")
+        client, _ = graph_client_1k
 
-        avg_time = sum(times) / len(times)
+        # Single round: measures the cold build (later calls hit the graph cache)
+        response = benchmark.pedantic(client.get, args=("/api/graph",), rounds=1)
+        assert response.status_code == 200
         data = response.json()
 
         print(f"\n=== 1K BENCHMARK: /api/graph endpoint ===")
         print(f"Nodes returned: {len(data['nodes'])}")
         print(f"Edges returned: {len(data['edges'])}")
-        print(f"Average time: {avg_time:.3f}s")
-        print(f"Throughput: {len(data['nodes']) / avg_time:.1f} nodes/sec")
 
-        assert avg_time < 30.0, f"/api/graph took too long: {avg_time:.3f}s"
+        _check_mean(benchmark, 30.0, "/api/graph", items=len(data["nodes"]), unit="nodes")
 
-    def test_1k_batch_methods(self, memov_with_1k_history):
+    def test_1k_batch_methods(self, memov_with_1k_history, enumerate_commits):
         """Benchmark batch methods with 1000 commits."""
-        from memov.core.git import GitManager
-
         manager, _ = memov_with_1k_history
-        branches = manager._load_branches()
-
-        # Get all commits
-        seen = set()
-        all_commits = []
-        for commit_hash in branches["branches"].values():
-            commit_history = GitManager.get_commit_history(manager.bare_repo_path, commit_hash)
-            for hash_id in commit_history:
-                if hash_id not in seen:
-                    seen.add(hash_id)
-                    all_commits.append(hash_id)
+        all_commits = enumerate_commits(manager)
 
         print(f"\nTotal commits found: {len(all_commits)}")
 
@@ -389,53 +416,29 @@ class Test1kBenchmark:
         print(f"SPEEDUP: {speedup:.1f}x")
 
 
+@pytest.mark.slow
 class TestLargeScaleBenchmark:
-    """Large scale benchmark tests (200+ commits)."""
-
-    def test_large_history_performance(self, memov_with_large_history):
-        """Benchmark get_history with 200 commits."""
-        manager = memov_with_large_history
-
-        # Benchmark status mode (used by /api/graph)
-        iterations = 3
-        times = []
+    """Large scale benchmark tests (200+ commits), sliced from the 1k history."""
 
-        for _ in range(iterations):
-            start = time.perf_counter()
-            history = manager.get_history(limit=500, diff_mode="status")
-            elapsed = time.perf_counter() - start
-            times.append(elapsed)
+    def test_large_history_performance(self, memov_with_1k_history, benchmark):
+        """Benchmark get_history with 500 of the 1000 commits."""
+        manager, _ = memov_with_1k_history
 
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
+        # Benchmark status mode (used by /api/graph); a single round is enough here too
+        history = benchmark.pedantic(
+            manager.get_history, kwargs={"limit": 500, "diff_mode": "status"}, rounds=1
+        )
 
         print(f"\n--- Large Scale: get_history(limit=500, diff_mode='status') ---")
         print(f"Commits returned: {len(history)}")
-        print(f"Average time: {avg_time:.3f}s")
-        print(f"Min time: {min_time:.3f}s")
-        print(f"Max time: {max_time:.3f}s")
-        print(f"Throughput: {len(history) / avg_time:.1f} commits/sec")
 
-        # Should handle 200 commits in reasonable time
-        assert avg_time < 10.0, f"Large history took too long: {avg_time:.3f}s"
+        # Should handle 500 commits in reasonable time
+        _check_mean(benchmark, 10.0, "Large history", items=len(history))
 
-    def test_large_batch_vs_individual(self, memov_with_large_history):
+    def test_large_batch_vs_individual(self, memov_with_1k_history, enumerate_commits):
         """Compare batch vs individual methods with 200 commits."""
-        from memov.core.git import GitManager
-
-        manager = memov_with_large_history
-        branches = manager._load_branches()
-
-        # Get all commits
-        seen = set()
-        all_commits = []
-        for commit_hash in branches["branches"].values():
-            commit_history = GitManager.get_commit_history(manager.bare_repo_path, commit_hash)
-            for hash_id in commit_history:
-                if hash_id not in seen:
-                    seen.add(hash_id)
-                    all_commits.append(hash_id)
+        manager, _ = memov_with_1k_history
+        all_commits = enumerate_commits(manager)
 
         test_commits = all_commits[:200]
 
@@ -471,97 +474,92 @@ class TestLargeScaleBenchmark:
         assert batch_time < individual_time_extrapolated, "Batch should be faster"
 
 
-class TestBatchMethodsBenchmark:
-    """Benchmark tests for batch git methods."""
+def _info_individual(manager, commit_hash):
+    """Fetch one commit's message and info the pre-batch way."""
+    message = GitManager.get_commit_message(manager.bare_repo_path, commit_hash)
+    info = manager._get_commit_info(commit_hash)
+    return {
+        "message": message,
+        "timestamp": info.get("timestamp"),
+        "author": info.get("author"),
+    }
+
+
+def _diff_individual(manager, commit_hash):
+    """Fetch one commit's diff status the pre-batch way."""
+    return manager._get_commit_diff_status(commit_hash)
 
-    def test_batch_vs_individual_commits_info(self, memov_with_many_snapshots):
-        """Compare batch vs individual commit info fetching."""
-        from memov.core.git import GitManager
 
-        manager = memov_with_many_snapshots
-        branches = manager._load_branches()
+def _bundle_individual(manager, commit_hash):
+    """Fetch one commit's message, files and note the pre-batch way."""
+    files, _ = GitManager.get_files_by_commit(manager.bare_repo_path, commit_hash)
+    return {
+        "message": GitManager.get_commit_message(manager.bare_repo_path, commit_hash),
+        "files": files,
+        "note": GitManager.get_commit_note(manager.bare_repo_path, commit_hash),
+    }
 
-        # Get all commits
-        seen = set()
-        all_commits = []
-        for commit_hash in branches["branches"].values():
-            commit_history = GitManager.get_commit_history(manager.bare_repo_path, commit_hash)
-            for hash_id in commit_history:
-                if hash_id not in seen:
-                    seen.add(hash_id)
-                    all_commits.append(hash_id)
+
+class TestBatchMethodsBenchmark:
+    """Benchmark tests for batch git methods."""
+
+    @pytest.mark.parametrize(
+        "batch_fn, individual_fn, label",
+        [
+            (GitManager.get_commits_info_batch, _info_individual, "Commit Info"),
+            (GitManager.get_diff_status_batch, _diff_individual, "Diff Status"),
+            (GitManager.get_commit_bundle, _bundle_individual, "Commit Bundle"),
+        ],
+        ids=["info", "diff", "bundle"],
+    )
+    def test_batch_vs_individual(
+        self, memov_with_many_snapshots, enumerate_commits, batch_fn, individual_fn, label
+    ):
+        """Compare a batch git method against its per-commit equivalent."""
+        manager, _ = memov_with_many_snapshots
+        all_commits = enumerate_commits(manager)
 
         # Limit to test set
         test_commits = all_commits[:30]
 
         # Benchmark batch method
         start = time.perf_counter()
-        batch_result = GitManager.get_commits_info_batch(manager.bare_repo_path, test_commits)
+        batch_result = batch_fn(manager.bare_repo_path, test_commits)
         batch_time = time.perf_counter() - start
 
         # Benchmark individual method
         start = time.perf_counter()
         individual_results = {}
         for commit_hash in test_commits:
-            message = GitManager.get_commit_message(manager.bare_repo_path, commit_hash)
-            info = manager._get_commit_info(commit_hash)
-            individual_results[commit_hash] = {
-                "message": message,
-                "timestamp": info.get("timestamp"),
-                "author": info.get("author"),
-            }
+            individual_results[commit_hash] = individual_fn(manager, commit_hash)
         individual_time = time.perf_counter() - start
 
         speedup = individual_time / batch_time if batch_time > 0 else float("inf")
 
-        print(f"\n--- Batch vs Individual Commit Info ({len(test_commits)} commits) ---")
+        print(f"\n--- Batch vs Individual {label} ({len(test_commits)} commits) ---")
         print(f"Batch method time: {batch_time:.3f}s")
         print(f"Individual method time: {individual_time:.3f}s")
         print(f"Speedup: {speedup:.1f}x")
 
-        # Verify batch returns same number of results
+        # Verify batch returns the same data, commit for commit
         assert len(batch_result) == len(test_commits), "Batch should return all commits"
+        for commit_hash in test_commits:
+            assert batch_result[commit_hash] == individual_results[commit_hash], commit_hash
 
         # Batch should be faster
         assert batch_time < individual_time, "Batch method should be faster"
 
-    def test_batch_diff_status(self, memov_with_many_snapshots):
-        """Benchmark batch diff status fetching."""
-        from memov.core.git import GitManager
-
-        manager = memov_with_many_snapshots
-        branches = manager._load_branches()
-
-        # Get all commits
-        seen = set()
-        all_commits = []
-        for commit_hash in branches["branches"].values():
-            commit_history = GitManager.get_commit_history(manager.bare_repo_path, commit_hash)
-            for hash_id in commit_history:
-                if hash_id not in seen:
-                    seen.add(hash_id)
-                    all_commits.append(hash_id)
-
-        test_commits = all_commits[:30]
-
-        # Benchmark batch method
-        start = time.perf_counter()
-        batch_result = GitManager.get_diff_status_batch(manager.bare_repo_path, test_commits)
-        batch_time = time.perf_counter() - start
+    def test_commit_bundle_keys_by_requested_hash(
+        self, memov_with_many_snapshots, enumerate_commits
+    ):
+        """Abbreviated and unknown hashes: results are keyed exactly as requested."""
+        manager, _ = memov_with_many_snapshots
+        full_hash = enumerate_commits(manager)[0]
+        short_hash = full_hash[:8]
 
-        # Benchmark individual method
-        start = time.perf_counter()
-        individual_results = {}
-        for commit_hash in test_commits:
-            individual_results[commit_hash] = manager._get_commit_diff_status(commit_hash)
-        individual_time = time.perf_counter() - start
-
-        speedup = individual_time / batch_time if batch_time > 0 else float("inf")
-
-        print(f"\n--- Batch vs Individual Diff Status ({len(test_commits)} commits) ---")
-        print(f"Batch method time: {batch_time:.3f}s")
-        print(f"Individual method time: {individual_time:.3f}s")
-        print(f"Speedup: {speedup:.1f}x")
+        bundle = GitManager.get_commit_bundle(
+            manager.bare_repo_path, [short_hash, full_hash, "0" * 40]
+        )
 
-        # Batch should be faster
-        assert batch_time < individual_time, "Batch method should be faster"
+        assert set(bundle) == {short_hash, full_hash}
+        assert bundle[short_hash] == bundle[full_hash] == _bundle_individual(manager, full_hash)
@@ -2,6 +2,7 @@
 
 import pytest
 
+from memov.core.git import nested_tree
 from memov.utils.string_utils import (
     clean_windows_git_lstree_output,
     normalize_path_separator,
@@ -79,6 +80,14 @@ class TestCleanWindowsGitLstreeOutput:
         with pytest.raises(TypeError):
             clean_windows_git_lstree_output(123)
 
+    def test_repeated_path_is_cached(self):
+        """An equal input should be answered from the cache."""
+        first = clean_windows_git_lstree_output('"src/cached.py"\r\n')
+        hits = clean_windows_git_lstree_output.cache_info().hits
+        second = clean_windows_git_lstree_output("".join(['"src/', 'cached.py"\r\n']))
+        assert first == second == "src/cached.py"
+        assert clean_windows_git_lstree_output.cache_info().hits == hits + 1
+
 
 class TestNormalizePathSeparator:
     """Tests for normalize_path_separator function."""
@@ -185,6 +194,11 @@ class TestSplitPathParts:
         assert split_path_parts("My Documents/file.txt") == ["My Documents", "file.txt"]
         assert split_path_parts("My Documents\\file.txt") == ["My Documents", "file.txt"]
 
+    def test_long_path_benchmark(self, benchmark):
+        """Benchmark splitting a deep path; guards the per-file cost in tree building."""
+        parts = benchmark(split_path_parts, "a/b/c/d/e/f.txt")
+        assert parts == ["a", "b", "c", "d", "e", "f.txt"]
+
 
 class TestCrossplatformIntegration:
     """Integration tests simulating cross-platform scenarios."""
@@ -198,13 +212,11 @@ class TestCrossplatformIntegration:
             "tests/test_main.py",
         ]
 
-        tree = {}
+        tree = nested_tree()
         for rel_path in rel_paths:
             parts = split_path_parts(rel_path)
             current = tree
             for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {}
                 current = current[part]
             current[parts[-1]] = "blob_hash"
 
@@ -224,13 +236,11 @@ class TestCrossplatformIntegration:
             "tests\\test_main.py",
         ]
 
-        tree = {}
+        tree = nested_tree()
         for rel_path in rel_paths:
             parts = split_path_parts(rel_path)
             current = tree
             for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {}
                 current = current[part]
             current[parts[-1]] = "blob_hash"
 
@@ -0,0 +1,130 @@
+"""Tests for VectorDB batch inserts and multi-type search (needs the rag extra)."""
+
+import zlib
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+from memov.storage.vectordb import VectorDB  # noqa: E402
+
+
+class _HashEmbedding(chromadb.EmbeddingFunction):
+    """Deterministic 8-dim embedding, so tests never download a model."""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        return [
+            [((zlib.crc32(text.encode("utf-8")) >> shift) & 255) / 255 for shift in range(0, 32, 4)]
+            for text in input
+        ]
+
+
+def _entry(i, agent_plan=""):
+    commit_hash = f"commit{i}"
+    return {
+        "commit_hash": commit_hash,
+        "prompt": f"prompt {i}",
+        "response": f"response {i}",
+        "agent_plan": agent_plan,
+        "metadata": {"commit_hash": commit_hash, "operation_type": "snap"},
+    }
+
+
+@pytest.fixture
+def vectordb(tmp_path, monkeypatch):
+    """VectorDB in a temp directory using the hash embedding."""
+    monkeypatch.setattr(
+        VectorDB, "_create_embedding_function", lambda self, *args: _HashEmbedding()
+    )
+    return VectorDB(persist_directory=tmp_path / "vectordb")
+
+
+class TestInsertSplittedBatch:
+    """Tests for insert_splitted_batch."""
+
+    def test_inserts_every_content_type(self, vectordb):
+        """Test each non-empty prompt/response/agent_plan becomes its own document."""
+        ids = vectordb.insert_splitted_batch([_entry(0, agent_plan="plan 0"), _entry(1)])
+
+        assert ids == [
+            "commit0_prompt_chunk_0",
+            "commit0_response_chunk_0",
+            "commit0_agent_plan_chunk_0",
+            "commit1_prompt_chunk_0",
+            "commit1_response_chunk_0",
+        ]
+        assert vectordb.collection.count() == 5
+        assert {doc["metadata"]["content_type"] for doc in vectordb.get_by_commit("commit0")} == {
+            "prompt",
+            "response",
+            "agent_plan",
+        }
+
+    def test_splits_adds_by_max_batch_size(self, vectordb, monkeypatch):
+        """Test a sync larger than Chroma's max batch size is written in several adds."""
+        batch_sizes = []
+        add = vectordb.collection.add
+
+        def counting_add(**kwargs):
+            batch_sizes.append(len(kwargs["ids"]))
+            return add(**kwargs)
+
+        monkeypatch.setattr(vectordb.collection, "add", counting_add)
+        monkeypatch.setattr(vectordb.client, "get_max_batch_size", lambda: 4)
+
+        ids = vectordb.insert_splitted_batch([_entry(i) for i in range(5)])
+
+        assert batch_sizes == [4, 4, 2]
+        assert vectordb.collection.count() == len(ids) == 10
+
+    def test_bumps_generation_once(self, vectordb):
+        """Test a batch write invalidates cached searches."""
+        generation = vectordb.generation
+        vectordb.insert_splitted_batch([_entry(0)])
+        assert vectordb.generation == generation + 1
+
+    def test_empty_batch_is_noop(self, vectordb):
+        """Test nothing is written (and no generation bump) for empty input."""
+        generation = vectordb.generation
+        assert vectordb.insert_splitted_batch([]) == []
+        assert vectordb.generation == generation
+
+
+class TestSearchByContentTypes:
+    """Tests for search_by_content_types."""
+
+    def test_filters_to_requested_types(self, vectordb):
+        """Test only documents of the requested content types are returned, closest first."""
+        vectordb.insert_splitted_batch([_entry(i, agent_plan=f"plan {i}") for i in range(3)])
+
+        results = vectordb.search_by_content_types(
+            "prompt 1", ["prompt", "agent_plan"], n_results=10
+        )
+
+        assert len(results) == 6
+        assert {r["metadata"]["content_type"] for r in results} == {"prompt", "agent_plan"}
+        assert results[0]["text"] == "prompt 1"
+        distances = [r["distance"] for r in results]
+        assert distances == sorted(distances)
+
+    def test_combines_with_where(self, vectordb):
+        """Test extra where conditions are and-ed with the type filter."""
+        vectordb.insert_splitted_batch([_entry(i) for i in range(3)])
+
+        results = vectordb.search_by_content_types(
+            "prompt", ["prompt"], n_results=10, where={"commit_hash": "commit2"}
+        )
+
+        assert [r["id"] for r in results] == ["commit2_prompt_chunk_0"]
+
+    def test_matches_single_type_search(self, vectordb):
+        """Test one content type gives the same hits as search_by_content_type."""
+        vectordb.insert_splitted_batch([_entry(i) for i in range(3)])
+
+        multi = vectordb.search_by_content_types("response 2", ["response"], n_results=3)
+        single = vectordb.search_by_content_type("response 2", "response", n_results=3)
+
+        assert [r["id"] for r in multi] == [r["id"] for r in single]
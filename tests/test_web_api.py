@@ -1,23 +1,82 @@
 """Tests for Web UI API endpoints."""
 
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
 
-from memov.web.server import create_app
+from memov.web.server import _parse_ai_search_response, create_app, get_project_path
+
+
+@pytest.fixture(scope="session")
+def _shared_app(_git_template):
+    """One app for the whole session; tests point it at their project via dependency override."""
+    return create_app(str(_git_template))
+
+
+@pytest.fixture
+def web_client_for(_shared_app):
+    """Return a factory giving a test client bound to the given project directory."""
+
+    def _client(project_path):
+        _shared_app.dependency_overrides[get_project_path] = lambda: str(project_path)
+        # Per-project caches must not leak between tests
+        _shared_app.state.graph_cache = None
+        _shared_app.state.ai_search_cache.clear()
+        return TestClient(_shared_app)
+
+    yield _client
+    _shared_app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def web_client(initialized_memov, temp_project):
+def web_client(initialized_memov, temp_project, web_client_for):
     """Create a test client for the web API."""
-    app = create_app(str(temp_project))
-    return TestClient(app)
+    return web_client_for(temp_project)
 
 
 @pytest.fixture
-def web_client_with_data(memov_with_snapshots, temp_project):
+def web_client_with_data(memov_with_snapshots, temp_project, web_client_for):
     """Create a test client with snapshot data."""
-    app = create_app(str(temp_project))
-    return TestClient(app)
+    return web_client_for(temp_project)
+
+
+@pytest.fixture(scope="module")
+def uninitialized_client(tmp_path_factory):
+    """Client for an app bound to an empty directory where `mem init` never ran."""
+    return TestClient(create_app(str(tmp_path_factory.mktemp("uninitialized"))))
+
+
+@pytest.fixture(scope="module")
+def _template_views(_shared_app, _snapshots_template):
+    """/api/graph and /api/branches bodies for the sample history, fetched once per module.
+
+    Every web_client_with_data project is a clone of the same template, so the hashes match.
+    """
+    overrides = dict(_shared_app.dependency_overrides)
+    _shared_app.dependency_overrides[get_project_path] = lambda: str(_snapshots_template)
+    try:
+        client = TestClient(_shared_app)
+        return client.get("/api/graph").json(), client.get("/api/branches").json()
+    finally:
+        _shared_app.dependency_overrides = overrides
+        _shared_app.state.graph_cache = None
+
+
+@pytest.fixture(scope="module")
+def commit_nodes(_template_views):
+    """Graph nodes of the sample history."""
+    return _template_views[0]["nodes"]
+
+
+@pytest.fixture(scope="module")
+def jump_state(commit_nodes, _template_views):
+    """Pre-jump view of the sample history: graph nodes plus the current branch and its tip."""
+    branches = _template_views[1]
+    current = branches["current"]
+    return SimpleNamespace(
+        nodes=commit_nodes, current_branch=current, tip=branches["branches"][current]
+    )
 
 
 class TestBranchesEndpoint:
@@ -52,8 +111,8 @@ class TestGraphEndpoint:
         assert "edges" in data
         assert "current_branch" in data
 
-    def test_get_graph_with_data(self, web_client_with_data):
-        """Test graph contains node data including agent_plan."""
+    def test_graph_shape_and_edges(self, web_client_with_data):
+        """Test graph node data (including agent_plan) and parent edges from one request."""
         response = web_client_with_data.get("/api/graph")
         assert response.status_code == 200
         data = response.json()
@@ -71,17 +130,23 @@ class TestGraphEndpoint:
         assert "agent_plan" in node
         assert "files" in node
 
-    def test_graph_edges_structure(self, web_client_with_data):
-        """Test edges represent parent relationships."""
-        response = web_client_with_data.get("/api/graph")
-        data = response.json()
+        # With 2+ commits, edges represent parent relationships
+        assert len(data["edges"]) >= 1
+        edge = data["edges"][0]
+        assert "from" in edge
+        assert "to" in edge
+
+    def test_graph_cache_invalidated_by_snapshot(self, web_client_with_data, memov_with_snapshots):
+        """Repeated requests reuse the cached body until a new snapshot moves the refs."""
+        first = web_client_with_data.get("/api/graph")
+        second = web_client_with_data.get("/api/graph")
+        assert first.content == second.content
+
+        memov_with_snapshots.snapshot(prompt="Another change", response="Done", by_user=False)
 
-        # With 2+ commits, should have at least 1 edge
-        if len(data["nodes"]) >= 2:
-            assert len(data["edges"]) >= 1
-            edge = data["edges"][0]
-            assert "from" in edge
-            assert "to" in edge
+        data = web_client_with_data.get("/api/graph").json()
+        assert len(data["nodes"]) == len(first.json()["nodes"]) + 1
+        assert any(node["prompt"] == "Another change" for node in data["nodes"])
 
 
 class TestCommitEndpoint:
@@ -92,11 +157,9 @@ class TestCommitEndpoint:
         response = web_client.get("/api/commit/nonexistent")
         assert response.status_code == 404
 
-    def test_get_commit_by_hash(self, web_client_with_data):
+    def test_get_commit_by_hash(self, web_client_with_data, commit_nodes):
         """Test getting commit details by hash."""
-        # First get a valid hash from graph
-        graph_response = web_client_with_data.get("/api/graph")
-        nodes = graph_response.json()["nodes"]
+        nodes = commit_nodes
         if not nodes:
             pytest.skip("No nodes in graph")
 
@@ -114,11 +177,9 @@ class TestCommitEndpoint:
 class TestDiffEndpoint:
     """Tests for /api/diff/{commit_hash} endpoint."""
 
-    def test_get_diff(self, web_client_with_data):
+    def test_get_diff(self, web_client_with_data, commit_nodes):
         """Test getting diff for a commit."""
-        # Get a valid hash first
-        graph_response = web_client_with_data.get("/api/graph")
-        nodes = graph_response.json()["nodes"]
+        nodes = commit_nodes
         if not nodes:
             pytest.skip("No nodes in graph")
 
@@ -134,11 +195,9 @@ class TestDiffEndpoint:
 class TestJumpEndpoint:
     """Tests for /api/jump/{commit_hash} endpoint."""
 
-    def test_jump_to_commit(self, web_client_with_data, temp_project):
+    def test_jump_to_commit(self, web_client_with_data, commit_nodes):
         """Test jumping to a specific commit."""
-        # Get graph to find a commit to jump to
-        graph_response = web_client_with_data.get("/api/graph")
-        nodes = graph_response.json()["nodes"]
+        nodes = commit_nodes
         if len(nodes) < 2:
             pytest.skip("Need at least 2 commits to test jump")
 
@@ -151,16 +210,11 @@ class TestJumpEndpoint:
         assert data["status"] == "success"
         assert "new_branch" in data
 
-    def test_jump_records_source_commit(self, web_client_with_data, temp_project):
+    def test_jump_records_source_commit(self, web_client_with_data, jump_state):
         """Test that jump records the source commit in jump_edges."""
-        # Get branches to find the actual current tip
-        branches_before = web_client_with_data.get("/api/branches").json()
-        current_branch = branches_before["current"]
-        source_commit = branches_before["branches"][current_branch]
-
-        # Get graph to find the oldest commit
-        graph_before = web_client_with_data.get("/api/graph").json()
-        nodes = graph_before["nodes"]
+        source_commit = jump_state.tip
+
+        nodes = jump_state.nodes
         if len(nodes) < 2:
             pytest.skip("Need at least 2 commits to test jump")
 
@@ -206,12 +260,10 @@ class TestJumpParentRelationship:
     """Tests for verifying parent relationships after jump."""
 
     def test_snap_after_jump_has_correct_parent(
-        self, web_client_with_data, temp_project, memov_with_snapshots
+        self, web_client_with_data, temp_project, memov_with_snapshots, commit_nodes
     ):
         """Test that a snap after jump uses jumped-to commit as parent."""
-        # Get graph before jump
-        graph_before = web_client_with_data.get("/api/graph").json()
-        nodes = graph_before["nodes"]
+        nodes = commit_nodes
         if len(nodes) < 2:
             pytest.skip("Need at least 2 commits to test jump parent")
 
@@ -273,26 +325,99 @@ class TestStatusEndpoint:
         assert data["initialized"] is True
         assert data["project_path"] == str(temp_project)
 
-    def test_status_not_initialized(self, temp_project):
+    def test_status_not_initialized(self, uninitialized_client):
         """Test status returns initialized=False for uninitialized project."""
-        app = create_app(str(temp_project))
-        client = TestClient(app)
-
-        response = client.get("/api/status")
+        response = uninitialized_client.get("/api/status")
         assert response.status_code == 200
         data = response.json()
         assert data["initialized"] is False
-        assert data["project_path"] == str(temp_project)
+        assert data["project_path"] == uninitialized_client.app.state.project_path
 
 
 class TestNotInitialized:
     """Tests for handling uninitialized memov."""
 
-    def test_branches_not_initialized(self, temp_project):
-        """Test error when memov not initialized."""
-        app = create_app(str(temp_project))
-        client = TestClient(app)
+    def test_branches_not_initialized(self, uninitialized_client):
+        """Test empty branch data (not an error) so the frontend can show its setup screen."""
+        response = uninitialized_client.get("/api/branches")
+        assert response.status_code == 200
+        assert response.json() == {"current": None, "branches": {}}
+
+
+class TestAISearchResponseParsing:
+    """Tests for parsing model replies in /api/search/ai."""
+
+    def test_parse_plain_json(self):
+        """Test plain JSON reply yields answer and commit ids."""
+        answer, commit_ids = _parse_ai_search_response(
+            '{"answer": "Fixed in abc1234", "commit_ids": ["abc1234"]}'
+        )
+        assert answer == "Fixed in abc1234"
+        assert commit_ids == ["abc1234"]
+
+    def test_parse_fenced_json(self):
+        """Test markdown-fenced JSON reply is unwrapped."""
+        answer, commit_ids = _parse_ai_search_response(
+            '```json\n{"answer": "ok", "commit_ids": ["def5678"]}\n```'
+        )
+        assert answer == "ok"
+        assert commit_ids == ["def5678"]
+
+    def test_parse_non_json_falls_back_to_hash_scan(self):
+        """Test non-JSON reply keeps raw text and scrapes short hashes."""
+        reply = "See commits ABC1234 and def5678."
+        answer, commit_ids = _parse_ai_search_response(reply)
+        assert answer == reply
+        assert commit_ids == ["abc1234", "def5678"]
+
+
+class TestAISearchCache:
+    """Tests for /api/search/ai answer reuse."""
+
+    def test_repeated_query_calls_model_once(self, web_client_with_data, monkeypatch):
+        """Test identical query over unchanged history skips the second model call."""
+        calls = []
+
+        async def fake_call_openai(client, api_key, system_prompt, user_prompt):
+            calls.append(user_prompt)
+            return '{"answer": "cached", "commit_ids": []}'
+
+        monkeypatch.setattr("memov.web.server._call_openai", fake_call_openai)
+        payload = {"api_key": "test", "query": "what changed?", "provider": "openai"}
+
+        first = web_client_with_data.post("/api/search/ai", json=payload)
+        second = web_client_with_data.post("/api/search/ai", json=payload)
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert len(calls) == 1
+
+    def test_different_api_key_not_served_from_cache(self, web_client_with_data, monkeypatch):
+        """Test a cached answer is not reused for a caller with another API key."""
+        calls = []
+
+        async def fake_call_openai(client, api_key, system_prompt, user_prompt):
+            calls.append(api_key)
+            return '{"answer": "cached", "commit_ids": []}'
+
+        monkeypatch.setattr("memov.web.server._call_openai", fake_call_openai)
+        payload = {"query": "what changed?", "provider": "openai"}
+
+        web_client_with_data.post("/api/search/ai", json={**payload, "api_key": "key-a"})
+        web_client_with_data.post("/api/search/ai", json={**payload, "api_key": "key-b"})
+
+        assert calls == ["key-a", "key-b"]
+
+
+class TestHTTPClientLifespan:
+    """Tests for the shared outbound HTTP client."""
+
+    def test_client_recreated_per_lifespan(self, tmp_path):
+        """Test each startup gets an open client and shutdown closes it."""
+        app = create_app(str(tmp_path))
+        assert app.state.http_client is None
 
-        response = client.get("/api/branches")
-        assert response.status_code == 400
-        assert "not initialized" in response.json()["detail"].lower()
+        for _ in range(2):
+            with TestClient(app):
+                assert not app.state.http_client.is_closed
+            assert app.state.http_client is None